@@ -0,0 +1,222 @@
+"""
+Alias sampling module.
+
+Samples weighted sectors in O(1) with Walker's alias method. The
+sectors are split into blocks with their own alias tables plus a
+top-level table over the block totals, so changing a single weight
+only rebuilds its block and the top table instead of everything.
+"""
+
+import math
+import random
+
+from sectors import SectorLayout
+
+BLOCK_SIZE = 1024
+
+
+def build_alias_table(weights) -> tuple:
+    """
+    Builds Walker's alias table of the given `weights` with Vose's
+    algorithm. Returns `(probabilities, aliases)` lists
+    """
+
+    n = len(weights)
+    total = math.fsum(weights)
+    scaled = [weight * n / total for weight in weights]
+    probabilities = [1.0] * n
+    aliases = list(range(n))
+
+    small = [i for i, p in enumerate(scaled) if p < 1]
+    large = [i for i, p in enumerate(scaled) if p >= 1]
+    while small and large:
+        less = small.pop()
+        more = large[-1]
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] = (scaled[more] + scaled[less]) - 1
+        if scaled[more] < 1:
+            small.append(large.pop())
+
+    # whatever is left is 1 up to rounding errors
+    for i in small + large:
+        probabilities[i] = 1.0
+        aliases[i] = i
+
+    return probabilities, aliases
+
+
+class AliasSampler:
+    """O(1) sampler of sector indices proportionally to their `weights`"""
+
+    def __init__(self, weights, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self.weights = [float(weight) for weight in weights]
+        if not self.weights or any(not weight > 0 for weight in self.weights):
+            raise ValueError("sector weights must be positive")
+
+        self.blocks = []
+        self.block_totals = []
+        for start in range(0, len(self.weights), block_size):
+            self.blocks.append(None)
+            self.block_totals.append(0.0)
+            self._build_block(len(self.blocks) - 1)
+        self._build_top()
+        self._arrays = None
+
+    @classmethod
+    def from_layout(cls, layout: SectorLayout, **kwargs) -> "AliasSampler":
+        return cls(layout.weights, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def _build_block(self, block: int):
+        start = block * self.block_size
+        weights = self.weights[start : start + self.block_size]
+        self.blocks[block] = build_alias_table(weights)
+        self.block_totals[block] = math.fsum(weights)
+
+    def _build_top(self):
+        self.top = build_alias_table(self.block_totals)
+
+    def update(self, weights: dict):
+        """
+        Changes weights of some sectors (`{sector: weight}`),
+        rebuilding only the affected blocks
+        """
+
+        blocks = set()
+        for sector, weight in weights.items():
+            if not weight > 0:
+                raise ValueError("sector weights must be positive")
+            self.weights[sector] = float(weight)
+            blocks.add(sector // self.block_size)
+
+        for block in blocks:
+            self._build_block(block)
+        self._build_top()
+        self._arrays = None
+
+    def sample(self, rng=random) -> int:
+        """Returns a random sector, `rng` is a `random.Random`-like generator"""
+
+        probabilities, aliases = self.top
+        n = len(probabilities)
+        u = rng.random() * n
+        block = int(u)
+        if u - block >= probabilities[block]:
+            block = aliases[block]
+
+        probabilities, aliases = self.blocks[block]
+        n = len(probabilities)
+        u = rng.random() * n
+        i = int(u)
+        if u - i >= probabilities[i]:
+            i = aliases[i]
+
+        return block * self.block_size + i
+
+    def sample_many(self, size: int, rng=None):
+        """
+        Returns an array of `size` random sectors. `rng` is a
+        `numpy.random.Generator`. Requires numpy
+        """
+
+        import numpy as np
+
+        if rng is None:
+            rng = np.random.default_rng()
+        top, probabilities, aliases, block_sizes = self._numpy_arrays()
+
+        u = rng.random(size) * len(top[0])
+        block = u.astype(np.int64)
+        block = np.where(u - block < top[0][block], block, top[1][block])
+
+        u = rng.random(size) * block_sizes[block]
+        i = u.astype(np.int64)
+        index = block * self.block_size + i
+        return np.where(u - i < probabilities[index], index, aliases[index])
+
+    def _numpy_arrays(self) -> tuple:
+        # flat copies of the tables, aliases are global sector indices
+        if self._arrays is None:
+            import numpy as np
+
+            probabilities = np.concatenate(
+                [np.asarray(p, dtype=np.float64) for p, _ in self.blocks]
+            )
+            aliases = np.concatenate(
+                [
+                    np.asarray(a, dtype=np.int64) + block * self.block_size
+                    for block, (_, a) in enumerate(self.blocks)
+                ]
+            )
+            top = (
+                np.asarray(self.top[0], dtype=np.float64),
+                np.asarray(self.top[1], dtype=np.int64),
+            )
+            block_sizes = np.array([len(p) for p, _ in self.blocks], dtype=np.int64)
+            self._arrays = top, probabilities, aliases, block_sizes
+
+        return self._arrays
+
+
+class TargetSampler:
+    """
+    Samples target angles of a weighted wheel: the target sector is
+    drawn from the alias table, the position within it uniformly
+    """
+
+    def __init__(self, layout: SectorLayout, block_size: int = BLOCK_SIZE):
+        self.layout = layout
+        self.sampler = AliasSampler.from_layout(layout, block_size=block_size)
+
+    def sample(self, rng=random) -> float:
+        """Returns a random target angle for `roulette.get_initial_speed`"""
+
+        sector = self.sampler.sample(rng)
+
+        return self.layout.sector_to_angle(sector, rng.random())
+
+    def sample_many(self, size: int, rng=None):
+        """Returns an array of `size` random target angles. Requires numpy"""
+
+        import numpy as np
+
+        if rng is None:
+            rng = np.random.default_rng()
+        sectors = self.sampler.sample_many(size, rng)
+        bounds = np.asarray(self.layout.bounds)
+        start = bounds[sectors]
+        extent = bounds[sectors + 1] - start
+
+        return np.mod(360 - (start + extent * rng.random(size)), 360)
+
+    def update(self, weights: dict):
+        """Changes weights of some sectors (`{sector: weight}`)"""
+
+        self.sampler.update(weights)
+        self.layout = SectorLayout(self.sampler.weights)
+
+    def set_layout(self, layout: SectorLayout):
+        """
+        Switches to the new `layout`, rebuilding only the blocks of the
+        changed weights when the sectors amount is the same
+        """
+
+        if layout.sectors_amount != self.layout.sectors_amount:
+            self.sampler = AliasSampler.from_layout(
+                layout, block_size=self.sampler.block_size
+            )
+        else:
+            changed = {
+                sector: weight
+                for sector, (weight, old) in enumerate(
+                    zip(layout.weights, self.layout.weights)
+                )
+                if weight != old
+            }
+            if changed:
+                self.sampler.update(changed)
+        self.layout = layout
@@ -0,0 +1,294 @@
+"""
+Benchmark module.
+
+Times roulette kinematics, sector mapping, spin planning and wheel
+rendering, and emits results as JSON. Every result is identified
+by its `name` and `params`, which stay stable between releases, so
+outputs of different versions can be compared directly.
+
+Wheel rendering needs a display; on a headless machine run it
+under a virtual one, e.g. `xvfb-run python benchmark.py`. Startup
+benchmarks time imports in fresh interpreters.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+
+import roulette
+import roulette_batch
+import utils
+from alias import AliasSampler, TargetSampler
+from deceleration import MODELS
+from planner import SpinPlanner
+from sectors import SectorLayout
+from secure_random import SecureRandom
+from stepper import AngleStepper
+from trajectory import SpinTrajectory
+
+FORMAT_VERSION = 1
+
+SECTORS_SWEEP = (6, 37, 100, 1000, 10000)
+FPS_SWEEP = (30, 60, 120, 240)
+BATCH_SIZES = (1000, 1_000_000)
+MIN_TIME = 0.2  # seconds a single measurement runs at least
+STARTUP_MODULES = (
+    "roulette",
+    "planner",
+    "cli",
+    "spin_service",
+    "fairness",
+    "wheel_visualizer",
+)
+
+
+def measure(func, min_time: float = MIN_TIME, repeat: int = 5) -> dict:
+    """
+    Times `func` calls, returns the best time per call of `repeat`
+    measurements in nanoseconds
+    """
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat, number)) / number
+
+    return {
+        "ns_per_op": best * 1e9,
+        "ops_per_s": 1 / best if best else None,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def bench_kinematics():
+    v0 = roulette.get_initial_speed(100, 10, 5)
+    a = roulette.get_acceleration(v0, 5)
+
+    yield "roulette.get_angle", {}, lambda: roulette.get_angle(v0, a, 2.5, 10)
+    yield "roulette.get_speed", {}, lambda: roulette.get_speed(v0, a, 2.5)
+    yield (
+        "roulette.get_initial_speed",
+        {},
+        lambda: roulette.get_initial_speed(100, 10, 5, 10),
+    )
+    yield "utils.interpolate", {}, lambda: utils.interpolate(3, 1, 10, 0.5, 1.5)
+    yield "utils.angle_to_sector", {}, lambda: utils.angle_to_sector(123.4, 37)
+    yield (
+        "stepper.AngleStepper.iter_frames",
+        {"frames": 300},
+        lambda: list(AngleStepper(v0, a, 1 / 60, 10).iter_frames(300)),
+    )
+
+    rng = np.random.default_rng(0)
+    for size in BATCH_SIZES:
+        times = rng.uniform(0, 5, size)
+        angles = rng.uniform(0, 360, size)
+        params = {"size": size}
+        yield (
+            "roulette_batch.get_angle",
+            params,
+            lambda times=times: roulette_batch.get_angle(v0, a, times, 10),
+        )
+        yield (
+            "roulette_batch.get_speed",
+            params,
+            lambda times=times: roulette_batch.get_speed(v0, a, times),
+        )
+        yield (
+            "roulette_batch.angle_to_sector",
+            params,
+            lambda angles=angles: roulette_batch.angle_to_sector(angles, 37),
+        )
+        # one frame of `size` concurrent spins
+        speeds = rng.uniform(0.5, 1.5, size) * v0
+        stepper = AngleStepper(speeds, speeds / -5, 1 / 60, 10)
+        yield "stepper.AngleStepper.advance", params, stepper.advance
+
+
+def bench_planning():
+    planner = SpinPlanner(37, 5, 5)
+
+    yield "planner.plan", {}, lambda: planner.plan(123.4, 10)
+    for model_name, model in MODELS.items():
+        model_planner = SpinPlanner(37, 5, 5, model=model())
+        model_spin = model_planner.plan(123.4, 10)
+        params = {"model": model_name}
+        yield (
+            "planner.plan",
+            params,
+            lambda model_planner=model_planner: model_planner.plan(123.4, 10),
+        )
+        yield (
+            "planner.Spin.angle_at",
+            params,
+            lambda model_spin=model_spin: model_spin.angle_at(2.345),
+        )
+
+    spin = planner.plan(123.4, 10)
+    for fps in FPS_SWEEP:
+        yield "planner.trajectory", {"fps": fps}, lambda fps=fps: spin.trajectory(fps)
+        yield (
+            "planner.trajectory",
+            {"fps": fps, "stepped": True},
+            lambda fps=fps: spin.trajectory(fps, stepped=True),
+        )
+
+    trajectory = SpinTrajectory(
+        spin.initial_speed, spin.acceleration, spin.spin_time, spin.initial_angle, 37
+    )
+    yield "trajectory.at_time", {}, lambda: trajectory.at_time(2.345)
+
+    for sectors_amount in SECTORS_SWEEP:
+        spin = SpinPlanner(sectors_amount, 5, 5).plan(123.4, 10)
+        yield (
+            "planner.Spin.crossings",
+            {"sectors": sectors_amount},
+            lambda spin=spin: list(spin.crossings()),
+        )
+
+
+def bench_sampling():
+    generators = {
+        "mersenne": random.Random(0),
+        "secure": SecureRandom(),
+        "system": random.SystemRandom(),
+    }
+    for name, rng in generators.items():
+        params = {"rng": name}
+        yield "rng.random", params, rng.random
+        yield "rng.randrange", params, lambda rng=rng: rng.randrange(37)
+
+    for sectors_amount in SECTORS_SWEEP:
+        weights = np.random.default_rng(0).uniform(1, 10, sectors_amount)
+        sampler = TargetSampler(SectorLayout(weights))
+        for name in ("mersenne", "secure"):
+            yield (
+                "alias.TargetSampler.sample",
+                {"sectors": sectors_amount, "rng": name},
+                lambda sampler=sampler, rng=generators[name]: sampler.sample(rng),
+            )
+
+    sampler = AliasSampler(np.random.default_rng(0).uniform(1, 10, 10000))
+    rng = np.random.default_rng(0)
+    for size in BATCH_SIZES:
+        yield (
+            "alias.AliasSampler.sample_many",
+            {"sectors": 10000, "size": size},
+            lambda size=size: sampler.sample_many(size, rng),
+        )
+
+
+def bench_startup():
+    # fresh interpreters, as spawned workers and short CLI jobs are
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    def run(code):
+        subprocess.run([sys.executable, "-c", code], cwd=directory, check=True)
+
+    yield "startup.interpreter", {}, lambda: run("pass")
+    for module in STARTUP_MODULES:
+        yield (
+            "startup.import",
+            {"module": module},
+            lambda module=module: run(f"import {module}"),
+        )
+
+
+def bench_rendering():
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception as e:  # no tkinter or `tk.TclError` without a display
+        print(f"skipping rendering benchmarks: {e}", file=sys.stderr)
+        return
+
+    from wheel_visualizer import WheelVisualizer
+
+    root.withdraw()
+    app = WheelVisualizer(root)
+
+    def frame():
+        app.angle = (app.angle + 7.3) % 360
+        app.draw_wheel()
+        root.update_idletasks()
+
+    try:
+        for lod_enabled in (True, False):
+            for sectors_amount in SECTORS_SWEEP:
+                app.lod_enabled = lod_enabled
+                app.sectors_amount_input.set(sectors_amount)
+                app.apply_settings()
+                params = {"sectors": sectors_amount, "lod": lod_enabled}
+                yield "wheel_visualizer.draw_wheel", params, frame
+    finally:
+        root.destroy()
+
+
+SUITES = {
+    "kinematics": bench_kinematics,
+    "planning": bench_planning,
+    "sampling": bench_sampling,
+    "startup": bench_startup,
+    "rendering": bench_rendering,
+}
+
+
+def run(suites=tuple(SUITES), name_filter: str = "", min_time: float = MIN_TIME):
+    """Runs the given benchmark `suites`, returns JSON-ready report"""
+
+    results = []
+    for suite in suites:
+        for name, params, func in SUITES[suite]():
+            if name_filter not in name:
+                continue
+            result = {"suite": suite, "name": name, "params": params}
+            result.update(measure(func, min_time))
+            print(
+                f"{name} {params}: {result['ns_per_op']:.1f} ns/op",
+                file=sys.stderr,
+            )
+            results.append(result)
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roulette benchmarks")
+    parser.add_argument("suites", nargs="*", help=f"any of {', '.join(SUITES)}")
+    parser.add_argument("-k", "--filter", default="", help="run names containing it")
+    parser.add_argument("-o", "--output", help="JSON file, stdout by default")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    args = parser.parse_args()
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite {suite!r}")
+
+    report = run(args.suites or list(SUITES), args.filter, args.min_time)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
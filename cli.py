@@ -0,0 +1,89 @@
+"""
+Command line entry point.
+
+    python cli.py <command> [arguments]
+
+Every command imports only the modules it needs, so headless
+commands never load tkinter and short jobs start fast. Run a
+command with `-h` for its arguments.
+"""
+
+import sys
+
+# command: (module, description), the module's `main` parses the rest,
+# commands without a module are implemented here
+COMMANDS = {
+    "gui": ("wheel_visualizer", "open the wheel window"),
+    "plan": (None, "plan a spin and print it as JSON"),
+    "export": ("exporter", "export a spin to GIF or PNGs"),
+    "serve": ("spin_service", "run the spin planning TCP service"),
+    "fairness": ("fairness", "run the fairness simulation"),
+    "journal": ("journal", "inspect and replay a spin journal"),
+    "benchmark": ("benchmark", "run the benchmarks"),
+}
+
+
+def plan_main():
+    import argparse
+    import json
+
+    from planner import SpinPlanner
+    from sectors import SectorLayout
+
+    parser = argparse.ArgumentParser(description=COMMANDS["plan"][1])
+    parser.add_argument("--sectors", type=int, default=6)
+    parser.add_argument(
+        "--weights", type=float, nargs="+", help="sector weights, override --sectors"
+    )
+    parser.add_argument("--spin-coeff", type=int, default=1)
+    parser.add_argument("--spin-time", type=float, default=5)
+    parser.add_argument("--target-angle", type=float, default=100)
+    parser.add_argument("--initial-angle", type=float, default=0)
+    args = parser.parse_args()
+
+    layout = SectorLayout(args.weights or (1,) * args.sectors)
+    spin = SpinPlanner(
+        layout.sectors_amount, args.spin_coeff, args.spin_time, layout
+    ).plan(args.target_angle, args.initial_angle)
+    print(
+        json.dumps(
+            {
+                "outcome": spin.outcome,
+                "spins_amount": spin.spins_amount,
+                "initial_angle": spin.initial_angle,
+                "initial_speed": spin.initial_speed,
+                "acceleration": spin.acceleration,
+            }
+        )
+    )
+
+
+def usage() -> str:
+    lines = ["usage: python cli.py <command> [arguments]", "", "commands:"]
+    for command, (_, description) in COMMANDS.items():
+        lines.append(f"  {command:<10} {description}")
+
+    return "\n".join(lines)
+
+
+def main(argv: list = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    command = argv[0]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        raise SystemExit(f"unknown command {command!r}")
+
+    # the command's own argument parser sees only its arguments
+    sys.argv = [f"{sys.argv[0]} {command}", *argv[1:]]
+    module_name = COMMANDS[command][0]
+    if module_name is None:
+        plan_main()
+    else:
+        __import__(module_name).main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Sector crossings module.
+
+Solves the spin kinematics for the times the wheel crosses sector
+boundaries, instead of sampling `roulette.get_angle` and watching
+the sector change. Crossings are generated lazily in time order, so
+long spins over many sectors do not have to fit in memory.
+"""
+
+import math
+from bisect import bisect_right
+
+from deceleration import ConstantMotion, Motion
+from sectors import SectorLayout
+
+
+def boundary_angles(layout: SectorLayout) -> list:
+    """
+    Returns `(angle, sector)` of the sector boundaries in ascending
+    wheel angle order within a turn. When the wheel angle passes
+    `angle`, the `sector` is left for the previous one
+    """
+
+    bounds = layout.bounds
+    boundaries = [(0.0, 0)]
+    boundaries.extend(
+        (360 - bounds[sector], sector)
+        for sector in range(layout.sectors_amount - 1, 0, -1)
+    )
+
+    return boundaries
+
+
+def crossed_in_turn(layout: SectorLayout, angle: float) -> int:
+    """
+    Returns amount of boundaries of `boundary_angles` a turn crosses
+    up to the wheel `angle` (between 0 and 360). A wheel on a boundary
+    has not crossed it yet, the same as `SectorLayout.angle_to_sector`
+    """
+
+    if angle == 0:
+        return 0
+    sector = layout.angle_to_sector(angle)
+    if sector == 0:
+        return layout.sectors_amount
+    return layout.sectors_amount - sector
+
+
+def iter_crossings(
+    initial_speed: float,
+    acceleration: float,
+    spin_time: float,
+    initial_angle: float = 0,
+    layout: SectorLayout = None,
+    motion: Motion = None,
+    start_time: float = 0,
+    stop_angle: float = None,
+):
+    """
+    Yields `(time, left sector, entered sector)` of every sector
+    boundary crossing of the spin from the `start time` on in time
+    order. A wheel starting on a boundary crosses it at once. Sectors
+    are uniform unless a sector `layout` is given, deceleration is
+    constant unless a solved deceleration `motion` is given. The wheel
+    stops at the `stop angle`, the end of the `motion` path by default
+    """
+
+    if layout is None:
+        layout = SectorLayout.uniform(1)
+    if initial_speed <= 0 or spin_time <= 0:
+        return
+    if motion is None:
+        motion = ConstantMotion.from_speed(initial_speed, acceleration, spin_time)
+
+    sectors_amount = layout.sectors_amount
+    boundaries = boundary_angles(layout)
+
+    # the first and the last turn are cut by the sectors the wheel
+    # starts and stops at, so that a wheel on a boundary agrees with
+    # `SectorLayout.angle_to_sector` however the path is rounded
+    end_angle = initial_angle + motion.path
+    if stop_angle is None:
+        stop_angle = end_angle
+    stop_angle %= 360
+    end_turn = 360 * round((end_angle - stop_angle) / 360)
+    last_crossed = crossed_in_turn(layout, stop_angle)
+
+    # the wheel may start a turn back, see `SpinPlanner.plan`
+    start_angle = initial_angle
+    if start_time > 0:
+        start_angle += motion.position(min(start_time, spin_time))
+    turn_angle = 360 * math.floor(start_angle / 360)
+    if start_time > 0:
+        # from the last boundary at or before the start, the position
+        # at the start time and the crossing times may round differently
+        angles = [angle for angle, _ in boundaries]
+        first = bisect_right(angles, start_angle - turn_angle) - 1
+    else:
+        first = crossed_in_turn(layout, start_angle - turn_angle)
+
+    while turn_angle <= end_turn:
+        last = last_crossed if turn_angle == end_turn else sectors_amount
+        for angle, sector in boundaries[first:last]:
+            path = turn_angle + angle - initial_angle
+            # only the first crossing may round to before the start
+            cur_time = motion.time_at(path) if path > 0 else 0.0
+            if cur_time < start_time:
+                continue
+            yield cur_time, sector, (sector - 1) % sectors_amount
+        first = 0
+        turn_angle += 360
+
+
+def crossing_times(
+    initial_speed: float,
+    acceleration: float,
+    spin_time: float,
+    initial_angle: float = 0,
+    layout: SectorLayout = None,
+    motion: Motion = None,
+) -> list:
+    """Returns all crossings of `iter_crossings` as a list"""
+
+    return list(
+        iter_crossings(
+            initial_speed, acceleration, spin_time, initial_angle, layout, motion
+        )
+    )
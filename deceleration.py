@@ -0,0 +1,365 @@
+"""
+Deceleration models module.
+
+A model describes how the wheel slows down. For the given path (in
+degrees, not wrapped) and spin time it is solved once into a
+`Motion` that starts at the path start and stops exactly at the
+path end at the spin time. Solutions are cached by the model, so
+replanning the same spin is free, and evaluating a motion at a
+given time is closed form.
+
+`ConstantDeceleration` is the model of the `roulette` module.
+"""
+
+import math
+from collections import OrderedDict
+
+import roulette
+
+CACHE_SIZE = 1024
+SOLVER_ITERATIONS = 100
+SOLVER_TOLERANCE = 1e-13  # relative to the spin time
+# higher drags start over 2.6 times faster than constant deceleration
+# and brake so hard that frames sampled for the animation are too
+# far apart, approaching a turn per frame for ordinary spins
+MAX_DRAG = 2
+
+
+def _solve_increasing(func, derivative, value: float, lo: float, hi: float) -> float:
+    """
+    Finds `x` in `[lo, hi]` where the increasing `func(x)` equals
+    the `value`, with Newton steps safeguarded by bisection
+    """
+
+    x = (lo + hi) / 2
+    tolerance = SOLVER_TOLERANCE * (hi - lo)
+    for _ in range(SOLVER_ITERATIONS):
+        error = func(x) - value
+        if error > 0:
+            hi = x
+        else:
+            lo = x
+
+        slope = derivative(x)
+        next_x = x - error / slope if slope > 0 else lo - 1
+        if not lo < next_x < hi:
+            next_x = (lo + hi) / 2
+        if abs(next_x - x) <= tolerance:
+            return next_x
+        x = next_x
+
+    return x
+
+
+class Motion:
+    """
+    Solved wheel motion that travels the `path` in degrees and stops
+    at the `spin time`. Subclasses implement `position`, `speed` and
+    `acceleration`, and override the inverse functions when they
+    have a closed form
+    """
+
+    def __init__(self, path: float, spin_time: float):
+        self.path = path
+        self.spin_time = spin_time
+        self.initial_speed = self.speed(0)
+
+    def position(self, cur_time: float) -> float:
+        """Returns path traveled by the given `time`"""
+
+        raise NotImplementedError
+
+    def speed(self, cur_time: float) -> float:
+        """Returns wheel speed at the given `time`"""
+
+        raise NotImplementedError
+
+    def acceleration(self, cur_time: float) -> float:
+        """Returns wheel acceleration at the given `time`"""
+
+        raise NotImplementedError
+
+    def angle(self, cur_time: float, initial_angle: float = 0) -> float:
+        """Returns wheel angle (between 0 and 360) at the given `time`"""
+
+        return (initial_angle + self.position(cur_time)) % 360
+
+    def time_at(self, path: float) -> float:
+        """Returns the time the wheel takes to travel the `path`"""
+
+        return _solve_increasing(self.position, self.speed, path, 0, self.spin_time)
+
+    def time_at_speed(self, speed: float) -> float:
+        """Returns the time the wheel slows down to the `speed`"""
+
+        return _solve_increasing(
+            lambda cur_time: -self.speed(cur_time),
+            lambda cur_time: -self.acceleration(cur_time),
+            -speed,
+            0,
+            self.spin_time,
+        )
+
+
+class ConstantMotion(Motion):
+    """Constant deceleration, evaluated with the `roulette` functions"""
+
+    def __init__(self, path: float, spin_time: float):
+        self._initial_speed = 2 * path / spin_time
+        self._acceleration = roulette.get_acceleration(self._initial_speed, spin_time)
+        super().__init__(path, spin_time)
+
+    @classmethod
+    def from_speed(
+        cls, initial_speed: float, acceleration: float, spin_time: float
+    ) -> "ConstantMotion":
+        """Motion of the already computed `roulette` spin parameters"""
+
+        motion = cls.__new__(cls)
+        motion._initial_speed = initial_speed
+        motion._acceleration = acceleration
+        Motion.__init__(
+            motion,
+            initial_speed * spin_time + acceleration * pow(spin_time, 2) / 2,
+            spin_time,
+        )
+
+        return motion
+
+    def position(self, cur_time: float) -> float:
+        return (
+            self._initial_speed * cur_time
+            + (self._acceleration * pow(cur_time, 2)) / 2
+        )
+
+    def speed(self, cur_time: float) -> float:
+        return roulette.get_speed(self._initial_speed, self._acceleration, cur_time)
+
+    def acceleration(self, cur_time: float) -> float:
+        return self._acceleration
+
+    def angle(self, cur_time: float, initial_angle: float = 0) -> float:
+        # same rounding as the rest of the `roulette` spins
+        return roulette.get_angle(
+            self._initial_speed, self._acceleration, cur_time, initial_angle
+        )
+
+    def time_at(self, path: float) -> float:
+        return roulette.get_time(self._initial_speed, self._acceleration, path)
+
+    def time_at_speed(self, speed: float) -> float:
+        return (speed - self._initial_speed) / self._acceleration
+
+
+class EasedMotion(Motion):
+    """
+    Ease-out curve: the traveled part of the path is `1 - (1 - t/T)^p`.
+    The `power` 2 is constant deceleration, higher powers brake harder
+    at the start and creep longer at the end, lower ones would need
+    infinite deceleration at the stop
+    """
+
+    def __init__(self, path: float, spin_time: float, power: float):
+        self.power = power
+        super().__init__(path, spin_time)
+
+    def _remaining(self, cur_time: float) -> float:
+        return max(1 - cur_time / self.spin_time, 0)
+
+    def position(self, cur_time: float) -> float:
+        return self.path * (1 - pow(self._remaining(cur_time), self.power))
+
+    def speed(self, cur_time: float) -> float:
+        return (
+            self.path
+            * self.power
+            / self.spin_time
+            * pow(self._remaining(cur_time), self.power - 1)
+        )
+
+    def acceleration(self, cur_time: float) -> float:
+        return (
+            -self.path
+            * self.power
+            * (self.power - 1)
+            / pow(self.spin_time, 2)
+            * pow(self._remaining(cur_time), self.power - 2)
+        )
+
+    def time_at(self, path: float) -> float:
+        remaining = max(1 - path / self.path, 0)
+        return self.spin_time * (1 - pow(remaining, 1 / self.power))
+
+    def time_at_speed(self, speed: float) -> float:
+        ratio = max(speed, 0) / self.initial_speed
+        return self.spin_time * (1 - pow(ratio, 1 / (self.power - 1)))
+
+
+class ExponentialMotion(Motion):
+    """
+    Viscous damping plus constant friction: `dv/dt = -rate * v - f`,
+    with the friction `f` chosen so that the wheel stops exactly at
+    the spin time. The path has no closed-form inverse
+    """
+
+    def __init__(self, path: float, spin_time: float, rate: float):
+        self.rate = rate
+        # speed is `scale * (exp(rate * (T - t)) - 1)`
+        self.scale = path / (math.expm1(rate * spin_time) / rate - spin_time)
+        super().__init__(path, spin_time)
+
+    def position(self, cur_time: float) -> float:
+        rate = self.rate
+        return self.scale * (
+            (math.exp(rate * self.spin_time) * -math.expm1(-rate * cur_time)) / rate
+            - cur_time
+        )
+
+    def speed(self, cur_time: float) -> float:
+        return self.scale * math.expm1(self.rate * (self.spin_time - cur_time))
+
+    def acceleration(self, cur_time: float) -> float:
+        return (
+            -self.rate
+            * self.scale
+            * math.exp(self.rate * (self.spin_time - cur_time))
+        )
+
+    def time_at_speed(self, speed: float) -> float:
+        return self.spin_time - math.log1p(max(speed, 0) / self.scale) / self.rate
+
+
+class FrictionDragMotion(Motion):
+    """
+    Constant friction plus quadratic air drag: `dv/dt = -f - k * v^2`,
+    with the friction `f` chosen so that the wheel stops exactly at
+    the spin time. The `drag` is relative to the path, `k = drag /
+    path`, so that the deceleration at the start is `e^(2 * drag)`
+    times the one at the stop whatever the path. Speed is
+    `c * tan(phi - w * t)` with `phi = w * T`
+    """
+
+    def __init__(self, path: float, spin_time: float, drag: float):
+        self.drag = drag
+        # the wheel stops after `-ln(cos(phi)) / k` degrees, the cosine
+        # is kept exact, `phi` itself rounds to `pi / 2` for high drags
+        self.stop_cos = math.exp(-drag)
+        self.stop_sin = math.sqrt(-math.expm1(-2 * drag))
+        self.phase = math.acos(self.stop_cos)
+        self.frequency = self.phase / spin_time
+        self.drag_per_degree = drag / path
+        self.terminal_speed = self.frequency / self.drag_per_degree
+        self.friction = self.frequency * self.terminal_speed
+        super().__init__(path, spin_time)
+
+    def _angle_left(self, cur_time: float) -> float:
+        return max(self.phase - self.frequency * cur_time, 0)
+
+    def position(self, cur_time: float) -> float:
+        # `cos(phi - w * t)` expanded around the exact stop cosine
+        angle = min(self.frequency * cur_time, self.phase)
+        cos_left = self.stop_cos * math.cos(angle) + self.stop_sin * math.sin(angle)
+        return math.log(cos_left / self.stop_cos) / self.drag_per_degree
+
+    def speed(self, cur_time: float) -> float:
+        return self.terminal_speed * math.tan(self._angle_left(cur_time))
+
+    def acceleration(self, cur_time: float) -> float:
+        return -self.friction - self.drag_per_degree * pow(self.speed(cur_time), 2)
+
+    def time_at(self, path: float) -> float:
+        cos_left = min(self.stop_cos * math.exp(self.drag_per_degree * path), 1)
+        return (self.phase - math.acos(cos_left)) / self.frequency
+
+    def time_at_speed(self, speed: float) -> float:
+        angle_left = math.atan(max(speed, 0) / self.terminal_speed)
+        return (self.phase - angle_left) / self.frequency
+
+
+class DecelerationModel:
+    """
+    Base of the deceleration models. Subclasses implement `_solve`,
+    `solve` caches up to `cache_size` solutions
+    """
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._solutions = OrderedDict()
+
+    def solve(self, path: float, spin_time: float) -> Motion:
+        """Returns motion that travels the `path` in the `spin time`"""
+
+        key = (path, spin_time)
+        motion = self._solutions.get(key)
+        if motion is not None:
+            self._solutions.move_to_end(key)
+            return motion
+
+        if path <= 0 or spin_time <= 0:
+            raise ValueError("path and spin time must be positive")
+        motion = self._solve(path, spin_time)
+        self._solutions[key] = motion
+        if len(self._solutions) > self.cache_size:
+            self._solutions.popitem(last=False)
+
+        return motion
+
+    def _solve(self, path: float, spin_time: float) -> Motion:
+        raise NotImplementedError
+
+    def clear_cache(self):
+        self._solutions.clear()
+
+
+class ConstantDeceleration(DecelerationModel):
+    """Constant deceleration of the `roulette` module"""
+
+    def _solve(self, path: float, spin_time: float) -> Motion:
+        return ConstantMotion(path, spin_time)
+
+
+class EasedDeceleration(DecelerationModel):
+    """Ease-out curve of the given `power`, see `EasedMotion`"""
+
+    def __init__(self, power: float = 3, cache_size: int = CACHE_SIZE):
+        if not power >= 2:
+            raise ValueError("power must be at least 2")
+        super().__init__(cache_size)
+        self.power = power
+
+    def _solve(self, path: float, spin_time: float) -> Motion:
+        return EasedMotion(path, spin_time, self.power)
+
+
+class ExponentialDeceleration(DecelerationModel):
+    """Exponential decay at the given `rate` per second, see `ExponentialMotion`"""
+
+    def __init__(self, rate: float = 1, cache_size: int = CACHE_SIZE):
+        if not rate > 0:
+            raise ValueError("rate must be positive")
+        super().__init__(cache_size)
+        self.rate = rate
+
+    def _solve(self, path: float, spin_time: float) -> Motion:
+        return ExponentialMotion(path, spin_time, self.rate)
+
+
+class FrictionDragDeceleration(DecelerationModel):
+    """Friction plus air `drag` relative to the path, see `FrictionDragMotion`"""
+
+    def __init__(self, drag: float = 1, cache_size: int = CACHE_SIZE):
+        if not 0 < drag <= MAX_DRAG:
+            raise ValueError(f"drag must be positive and at most {MAX_DRAG}")
+        super().__init__(cache_size)
+        self.drag = drag
+
+    def _solve(self, path: float, spin_time: float) -> Motion:
+        return FrictionDragMotion(path, spin_time, self.drag)
+
+
+MODELS = {
+    "constant": ConstantDeceleration,
+    "eased": EasedDeceleration,
+    "exponential": ExponentialDeceleration,
+    "friction-drag": FrictionDragDeceleration,
+}
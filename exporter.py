@@ -0,0 +1,347 @@
+"""
+Spin export module.
+
+Renders spins offscreen with the same geometry as
+`WheelVisualizer.draw_wheel` and encodes them to an animated GIF or
+a PNG sequence. The wheel is rasterized once into a sprite that is
+rotated per frame; frame ranges are rendered in worker processes.
+
+Requires Pillow.
+"""
+
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+import palette
+import wheel_geometry
+from deceleration import MODELS
+from planner import Spin, SpinPlanner
+from sectors import SectorLayout
+
+DEFAULT_FPS = 30
+# GIF delays are whole centiseconds and players stretch delays of
+# 1 cs or less, faster frame rates are exported at this one
+MAX_GIF_FPS = 50
+FONT_NAMES = ("DejaVuSans-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf")
+
+
+@lru_cache(maxsize=None)
+def load_font(size: int = wheel_geometry.FONT_SIZE) -> ImageFont.ImageFont:
+    for name in FONT_NAMES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+
+    return ImageFont.load_default(size)
+
+
+def tk_arc_angles(start: float, extent: float) -> tuple:
+    """
+    Converts Tk arc `start` and `extent` (counterclockwise) to
+    Pillow `start` and `end` angles (clockwise)
+    """
+
+    return -(start + extent), -start
+
+
+def render_sprite(
+    colors: tuple,
+    layout: SectorLayout,
+    lod: bool = True,
+    radius: int = wheel_geometry.WHEEL_RADIUS,
+) -> Image.Image:
+    """
+    Rasterizes the wheel sectors at the zero wheel angle. The sprite
+    is a square RGBA image with the wheel center in its middle
+    """
+
+    r = radius
+    size = 2 * r + 2
+    sprite = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+
+    if lod:
+        groups = wheel_geometry.lod_groups(layout, r)
+    else:
+        groups = list(range(layout.sectors_amount))
+    box = (1, 1, 2 * r + 1, 2 * r + 1)
+    for first, end in zip(groups, groups[1:] + [layout.sectors_amount]):
+        fill = colors[first % len(colors)]
+        draw.pieslice(
+            box,
+            *tk_arc_angles(
+                wheel_geometry.sector_start(layout, first, 0),
+                layout.bounds[end] - layout.bounds[first],
+            ),
+            fill=fill,
+            outline="black" if end - first == 1 else fill,
+            width=1,
+        )
+
+    return sprite
+
+
+def sprite_position(sprite: Image.Image) -> tuple:
+    """Returns the canvas position of the sprite's top left corner"""
+
+    return (
+        wheel_geometry.WHEEL_CENTER_X - sprite.width // 2,
+        wheel_geometry.WHEEL_CENTER_Y - sprite.height // 2,
+    )
+
+
+def render_frame(
+    sprite: Image.Image,
+    colors: tuple,
+    spin: Spin,
+    cur_time: float,
+    lod: bool = True,
+) -> Image.Image:
+    """Renders the whole canvas of the `spin` at the given `time`"""
+
+    angle = spin.angle_at(cur_time)
+    speed = spin.speed_at(cur_time)
+    if cur_time >= spin.spin_time:
+        speed = 0
+
+    frame = Image.new(
+        "RGB", (wheel_geometry.CANVAS_WIDTH, wheel_geometry.CANVAS_HEIGHT), "white"
+    )
+    rotated = sprite.rotate(angle, resample=Image.BILINEAR)
+    frame.paste(rotated, sprite_position(sprite), rotated)
+    draw_overlay(
+        ImageDraw.Draw(frame),
+        colors,
+        spin.layout,
+        angle,
+        speed,
+        spin.acceleration_at(cur_time),
+        spin.target_angle,
+        lod,
+    )
+
+    return frame
+
+
+def draw_overlay(
+    draw: ImageDraw.ImageDraw,
+    colors: tuple,
+    layout: SectorLayout,
+    angle: float,
+    speed: float,
+    acceleration: float,
+    target_angle: float,
+    lod: bool = True,
+):
+    """Draws everything of the wheel that does not rotate with the sprite"""
+
+    cx = wheel_geometry.WHEEL_CENTER_X
+    cy = wheel_geometry.WHEEL_CENTER_Y
+    r = wheel_geometry.WHEEL_RADIUS
+    box = (cx - r, cy - r, cx + r, cy + r)
+    font = load_font()
+    selected_sector = layout.angle_to_sector(angle)
+
+    draw.pieslice(
+        box,
+        *tk_arc_angles(
+            wheel_geometry.sector_start(layout, selected_sector, angle),
+            layout.extent(selected_sector),
+        ),
+        fill=colors[selected_sector % len(colors)],
+        outline="black",
+        width=2,
+    )
+
+    # labels stay upright, so they are not a part of the sprite
+    if not lod:
+        label_sectors = range(layout.sectors_amount)
+    elif abs(speed) <= wheel_geometry.LOD_MAX_LABEL_SPEED:
+        label_sectors = wheel_geometry.label_sectors(layout)
+    else:
+        label_sectors = ()
+    for i in label_sectors:
+        draw.text(
+            wheel_geometry.label_position(layout, i, angle),
+            str(i + 1),
+            fill="black",
+            font=font,
+            anchor="mm",
+        )
+
+    draw.pieslice(
+        box,
+        *tk_arc_angles(
+            wheel_geometry.pointer_start(angle, target_angle),
+            wheel_geometry.POINTER_EXTENT,
+        ),
+        fill="red",
+        outline="black",
+    )
+    draw.polygon(wheel_geometry.ARROW, fill="gray", outline="black")
+
+    texts = wheel_geometry.hud_texts(
+        selected_sector,
+        speed,
+        acceleration,
+        layout.angle_to_sector(target_angle),
+    )
+    for y, text in zip(wheel_geometry.HUD_LINES_Y, texts):
+        draw.text((cx, y), text, fill="black", font=font, anchor="mm")
+
+
+@lru_cache(maxsize=4)
+def _cached_sprite(colors: tuple, layout: SectorLayout, lod: bool) -> Image.Image:
+    # every worker process rasterizes the sprite once
+    return render_sprite(colors, layout, lod)
+
+
+def render_frames(
+    spin: Spin,
+    colors: tuple,
+    fps: float,
+    start: int,
+    stop: int,
+    lod: bool = True,
+    directory: str = None,
+) -> list:
+    """
+    Renders frames `[start, stop)` of the spin. Frames are written
+    as PNG files to the `directory` if it is given, otherwise they
+    are returned palettized for GIF encoding
+    """
+
+    sprite = _cached_sprite(colors, spin.layout, lod)
+    frames = []
+    for index in range(start, stop):
+        frame = render_frame(
+            sprite, colors, spin, min(index / fps, spin.spin_time), lod
+        )
+        if directory is not None:
+            frame.save(os.path.join(directory, f"frame_{index:05d}.png"))
+        else:
+            frames.append(
+                frame.quantize(
+                    256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE
+                )
+            )
+
+    return frames
+
+
+def gif_durations(frames_amount: int, fps: float) -> list:
+    """
+    Returns GIF frame durations in milliseconds. Durations are whole
+    centiseconds rounded from the frame times, so they add up to the
+    played time instead of accumulating the rounding of every frame
+    """
+
+    stamps = [round(index * 100 / fps) for index in range(frames_amount + 1)]
+
+    return [10 * (stop - start) for start, stop in zip(stamps, stamps[1:])]
+
+
+def export_spin(
+    spin: Spin,
+    colors: list,
+    path: str,
+    fps: float = DEFAULT_FPS,
+    workers: int = None,
+    lod: bool = True,
+) -> int:
+    """
+    Exports the whole `spin` to the `path`: an animated GIF if it
+    ends with `.gif`, otherwise a directory of PNG frames. Returns
+    amount of frames. GIFs are exported at most at `MAX_GIF_FPS`
+    """
+
+    colors = tuple(colors)
+    is_gif = path.lower().endswith(".gif")
+    if is_gif:
+        fps = min(fps, MAX_GIF_FPS)
+    frames_amount = math.ceil(spin.spin_time * fps) + 1
+    workers = workers or os.cpu_count()
+    chunk = math.ceil(frames_amount / workers)
+    ranges = [
+        (start, min(start + chunk, frames_amount))
+        for start in range(0, frames_amount, chunk)
+    ]
+
+    directory = None
+    if not is_gif:
+        os.makedirs(path, exist_ok=True)
+        directory = path
+
+    frames = []
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(
+                render_frames, spin, colors, fps, start, stop, lod, directory
+            )
+            for start, stop in ranges
+        ]
+        for future in futures:
+            frames.extend(future.result())
+
+    if is_gif:
+        frames[0].save(
+            path,
+            save_all=True,
+            append_images=frames[1:],
+            duration=gif_durations(frames_amount, fps),
+            loop=0,
+            # frames are already palettized by the workers, palette
+            # optimization in the main process would dominate export
+            optimize=False,
+        )
+
+    return frames_amount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a spin to GIF or PNGs")
+    parser.add_argument("path", help="`.gif` file or directory for PNG frames")
+    parser.add_argument("--sectors", type=int, default=6)
+    parser.add_argument(
+        "--weights", type=float, nargs="+", help="sector weights, override --sectors"
+    )
+    parser.add_argument("--spin-coeff", type=int, default=1)
+    parser.add_argument("--spin-time", type=float, default=5)
+    parser.add_argument("--target-angle", type=float, default=100)
+    parser.add_argument("--initial-angle", type=float, default=0)
+    parser.add_argument(
+        "--deceleration", choices=MODELS, default="constant", help="deceleration model"
+    )
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None, help="colors seed")
+    parser.add_argument("--no-lod", action="store_true")
+    args = parser.parse_args()
+
+    layout = SectorLayout(args.weights or (1,) * args.sectors)
+    spin = SpinPlanner(
+        layout.sectors_amount,
+        args.spin_coeff,
+        args.spin_time,
+        layout,
+        MODELS[args.deceleration](),
+    ).plan(args.target_angle, args.initial_angle)
+    frames_amount = export_spin(
+        spin,
+        palette.get_palette(layout.sectors_amount, args.seed),
+        args.path,
+        args.fps,
+        args.workers,
+        not args.no_lod,
+    )
+    print(f"{frames_amount} frames written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
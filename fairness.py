@@ -0,0 +1,328 @@
+"""
+Fairness simulation module.
+
+Monte Carlo check that random targets drawn the way
+`WheelVisualizer.random_target` draws them (a sector from the
+`alias.TargetSampler` alias table, a uniform fractional angle inside
+it) give sector frequencies proportional to the sector weights.
+Spins are sampled in vectorized chunks across a process pool; every
+task has its own seeded random stream, so the result only depends
+on the seed and not on the amount of workers.
+
+`check_events` plans spins one after another the way the app does
+and checks that the sector the events leave selected at the stop is
+the outcome of every spin.
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+import roulette_batch
+import spin_events
+from alias import TargetSampler
+from planner import SpinPlanner
+from sectors import SectorLayout
+
+CHUNK_SIZE = 1 << 20  # spins sampled at once by a worker
+TASK_SIZE = 1 << 24  # spins per task sent to the pool
+
+
+@dataclass
+class FairnessReport:
+    """Merged result of a simulation"""
+
+    spins: int
+    sectors_amount: int
+    histogram: np.ndarray
+    expected: np.ndarray
+    chi_square: float
+    degrees_of_freedom: int
+    p_value: float
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """Simulated spins per second"""
+
+        return self.spins / self.elapsed if self.elapsed else math.inf
+
+    def __str__(self) -> str:
+        deviation = (np.abs(self.histogram - self.expected) / self.expected).max()
+
+        return "\n".join(
+            (
+                f"spins: {self.spins}",
+                f"sectors: {self.sectors_amount}",
+                f"max relative deviation: {deviation:.3e}",
+                f"chi-square: {self.chi_square:.3f} "
+                f"(dof {self.degrees_of_freedom}, p-value {self.p_value:.4f})",
+                f"elapsed: {self.elapsed:.2f} s",
+                f"throughput: {self.throughput:.4g} spins/s",
+            )
+        )
+
+
+def simulate_task(
+    seed_sequence: np.random.SeedSequence,
+    spins: int,
+    sectors_amount: int,
+    chunk_size: int = CHUNK_SIZE,
+    spin_plan: tuple = None,
+    weights: tuple = None,
+) -> np.ndarray:
+    """
+    Simulates `spins` spins and returns sector histogram. Sectors
+    are uniform unless their `weights` are given.
+
+    If `spin plan` (`spin coeff`, `spin time`) is given, every
+    target angle goes through the whole spin planning and the
+    sector is taken from the wheel angle at the end of the spin
+    """
+
+    rng = np.random.default_rng(seed_sequence)
+    layout = _layout(sectors_amount, weights)
+    target_sampler = TargetSampler(layout)
+    histogram = np.zeros(sectors_amount, dtype=np.int64)
+
+    while spins > 0:
+        size = min(spins, chunk_size)
+        angles = target_sampler.sample_many(size, rng)
+        if spin_plan is not None:
+            angles = _final_angles(angles, *spin_plan)
+        sectors = layout.angles_to_sectors(angles)
+        histogram += np.bincount(sectors, minlength=sectors_amount)
+        spins -= size
+
+    return histogram
+
+
+def _layout(sectors_amount: int, weights: tuple = None) -> SectorLayout:
+    if weights is None:
+        return SectorLayout.uniform(sectors_amount)
+    return SectorLayout(weights)
+
+
+def _final_angles(target_angle, spin_coeff: int, spin_time: float):
+    spins_amount = roulette_batch.get_spins_amount(spin_coeff, spin_time)
+    initial_speed = roulette_batch.get_initial_speed(
+        target_angle, spins_amount, spin_time
+    )
+    acceleration = roulette_batch.get_acceleration(initial_speed, spin_time)
+
+    return roulette_batch.get_angle(initial_speed, acceleration, spin_time)
+
+
+def simulate(
+    spins: int,
+    sectors_amount: int,
+    workers: int = None,
+    seed: int = None,
+    chunk_size: int = CHUNK_SIZE,
+    task_size: int = TASK_SIZE,
+    spin_plan: tuple = None,
+    weights: tuple = None,
+) -> FairnessReport:
+    """
+    Runs the simulation on `workers` processes (all cores by default).
+    Sector `weights` override the `sectors amount`
+    """
+
+    started = time.perf_counter()
+    if weights is not None:
+        weights = tuple(weights)
+        sectors_amount = len(weights)
+
+    tasks_amount = max(1, math.ceil(spins / task_size))
+    seed_sequences = np.random.SeedSequence(seed).spawn(tasks_amount)
+    task_spins = [task_size] * (tasks_amount - 1)
+    task_spins.append(spins - task_size * (tasks_amount - 1))
+
+    histogram = np.zeros(sectors_amount, dtype=np.int64)
+    with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+        for task_histogram in executor.map(
+            simulate_task,
+            seed_sequences,
+            task_spins,
+            [sectors_amount] * tasks_amount,
+            [chunk_size] * tasks_amount,
+            [spin_plan] * tasks_amount,
+            [weights] * tasks_amount,
+        ):
+            histogram += task_histogram
+
+    layout_weights = np.asarray(_layout(sectors_amount, weights).weights)
+    expected = spins * layout_weights / layout_weights.sum()
+    chi_square, p_value = chi_square_test(histogram, expected)
+
+    return FairnessReport(
+        spins,
+        sectors_amount,
+        histogram,
+        expected,
+        chi_square,
+        sectors_amount - 1,
+        p_value,
+        time.perf_counter() - started,
+    )
+
+
+def check_events(
+    spins: int,
+    sectors_amount: int,
+    seed: int = None,
+    spin_plan: tuple = (1, 5),
+    weights: tuple = None,
+) -> int:
+    """
+    Plans `spins` spins with the `spin plan` (`spin coeff`, `spin
+    time`), each starting where the previous one stopped, and returns
+    amount of spins whose last entered sector is not their outcome.
+    Every other target is on a sector boundary, where the wheel starts
+    the next spin on a boundary too
+    """
+
+    rng = np.random.default_rng(seed)
+    layout = _layout(sectors_amount, weights)
+    target_sampler = TargetSampler(layout)
+    planner = SpinPlanner(layout.sectors_amount, *spin_plan, layout=layout)
+
+    mismatches = 0
+    current_angle = 0
+    for _ in range(spins):
+        if rng.random() < 0.5:
+            target_angle = target_sampler.sample(rng)
+        else:
+            sector = int(rng.integers(layout.sectors_amount))
+            target_angle = layout.sector_to_angle(sector, 0) % 360
+        spin = planner.plan(target_angle, current_angle)
+
+        sector = None
+        for event in spin_events.iter_events(spin):
+            if event.kind == spin_events.SECTOR_ENTERED:
+                sector = event.sector
+        if sector != spin.outcome:
+            mismatches += 1
+        current_angle = target_angle
+
+    return mismatches
+
+
+def chi_square_test(histogram, expected=None) -> tuple:
+    """
+    Pearson's chi-square test of the `histogram` against the
+    `expected` frequencies, uniform by default. Returns
+    `(statistic, p-value)`
+    """
+
+    histogram = np.asarray(histogram, dtype=np.float64)
+    if expected is None:
+        expected = histogram.sum() / len(histogram)
+    statistic = float(((histogram - expected) ** 2 / expected).sum())
+    degrees_of_freedom = len(histogram) - 1
+    if degrees_of_freedom < 1:
+        return statistic, 1.0
+
+    return statistic, _gamma_q(degrees_of_freedom / 2, statistic / 2)
+
+
+def _gamma_q(a: float, x: float) -> float:
+    """Regularized upper incomplete gamma function `Q(a, x)`"""
+
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        # series for P(a, x)
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+
+    # Lentz's continued fraction for Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+
+    return h * math.exp(log_prefix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roulette fairness simulation")
+    parser.add_argument("--spins", type=int, default=10**9)
+    parser.add_argument("--sectors", type=int, default=6)
+    parser.add_argument(
+        "--weights", type=float, nargs="+", help="sector weights, override --sectors"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--spin-plan",
+        type=float,
+        nargs=2,
+        metavar=("COEFF", "TIME"),
+        help="map targets through the whole spin with the given settings",
+    )
+    parser.add_argument(
+        "--check-events",
+        type=int,
+        metavar="SPINS",
+        help="only check the events of the given amount of spins in a row",
+    )
+    args = parser.parse_args()
+
+    spin_plan = None
+    if args.spin_plan:
+        spin_plan = (int(args.spin_plan[0]), args.spin_plan[1])
+
+    if args.check_events:
+        weights = args.weights or [1] * args.sectors
+        mismatches = check_events(
+            args.check_events,
+            len(weights),
+            args.seed,
+            spin_plan or (1, 5),
+            weights,
+        )
+        print(f"spins whose events end off the outcome: {mismatches}")
+        return
+
+    print(
+        simulate(
+            args.spins,
+            args.sectors,
+            args.workers,
+            args.seed,
+            args.chunk_size,
+            spin_plan=spin_plan,
+            weights=args.weights,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
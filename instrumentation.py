@@ -0,0 +1,101 @@
+"""
+Frame instrumentation module.
+
+Keeps per-frame timings of the animation in fixed-size ring buffers
+and summarizes them as percentiles.
+"""
+
+import math
+from array import array
+
+FIELDS = ("frame", "kinematics", "canvas", "lateness")
+
+
+class FrameStats:
+    """
+    Timings (seconds) of the last `capacity` frames: whole `frame`,
+    `kinematics` evaluation, `canvas` items update and scheduler
+    `lateness` (how late the frame started after its deadline)
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.buffers = {field: array("d", bytes(8 * capacity)) for field in FIELDS}
+        self.index = 0
+        self.count = 0
+        self.frames = 0
+        self.dropped_frames = 0
+
+    def record(
+        self,
+        frame: float,
+        kinematics: float,
+        canvas: float,
+        lateness: float,
+        dropped_frames: int = 0,
+    ):
+        """Records timings of a single frame"""
+
+        i = self.index
+        buffers = self.buffers
+        buffers["frame"][i] = frame
+        buffers["kinematics"][i] = kinematics
+        buffers["canvas"][i] = canvas
+        buffers["lateness"][i] = lateness
+
+        self.index = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+        self.dropped_frames += dropped_frames
+
+    def reset(self):
+        self.index = 0
+        self.count = 0
+        self.frames = 0
+        self.dropped_frames = 0
+
+    def values(self, field: str = "frame") -> list:
+        """Returns recorded values of the `field`, oldest first"""
+
+        buffer = self.buffers[field]
+        if self.count < self.capacity:
+            return buffer[: self.count].tolist()
+
+        return (buffer[self.index :] + buffer[: self.index]).tolist()
+
+    def percentiles(self, field: str = "frame", ps=(50, 95, 99)) -> dict:
+        """Returns nearest-rank percentiles of the recorded `field` values"""
+
+        values = sorted(self.buffers[field][: self.count])
+        if not values:
+            return {p: 0.0 for p in ps}
+
+        return {
+            p: values[max(0, math.ceil(p / 100 * len(values)) - 1)] for p in ps
+        }
+
+    def summary(self) -> dict:
+        """Returns frame time percentiles and frame counters"""
+
+        summary = {
+            f"{field}_p{p}": value
+            for field in FIELDS
+            for p, value in self.percentiles(field).items()
+        }
+        summary["frames"] = self.frames
+        summary["dropped_frames"] = self.dropped_frames
+
+        return summary
+
+    def overlay_text(self) -> str:
+        """Returns short summary for the on-canvas overlay"""
+
+        frame = self.percentiles("frame")
+        lateness = self.percentiles("lateness", (95,))
+
+        return (
+            f"frame p50/p95/p99: {frame[50] * 1000:.2f}/"
+            f"{frame[95] * 1000:.2f}/{frame[99] * 1000:.2f} ms\n"
+            f"late p95: {lateness[95] * 1000:.2f} ms, "
+            f"dropped: {self.dropped_frames}/{self.frames + self.dropped_frames}"
+        )
@@ -0,0 +1,484 @@
+"""
+Spin journal module.
+
+Append-only binary log of spin plans for replaying disputed spins.
+Every spin is a fixed-size little-endian record, so the reader maps
+the file into memory and finds the spin `i` by its offset without
+reading the rest. Writes are batched and fsynced periodically, at
+the latest `sync interval` seconds after they were appended.
+
+Weights of non-uniform sector layouts are kept in a side file next
+to the journal (`<path>.layouts`), every distinct layout once,
+records refer to them by their number. Replayed spins reproduce the
+recorded kinematics and outcome exactly.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+import deceleration
+from planner import Spin
+from sectors import SectorLayout
+
+MAGIC = b"SPNJ"
+VERSION = 2
+
+# magic, version, record size
+_HEADER = struct.Struct("<4sHH")
+
+# sectors amount, spin coeff, spins amount, outcome, model code,
+# uniform sectors flag, layout number (0 when not recorded), spin
+# time, target angle, initial angle, initial speed, acceleration,
+# model parameter, RNG seed
+_RECORD = struct.Struct("<iiiiB?2xIddddddQ")
+
+LAYOUTS_SUFFIX = ".layouts"
+LAYOUTS_MAGIC = b"SPNL"
+# weights digest, sectors amount, followed by the float64 weights
+_LAYOUT = struct.Struct("<16sI")
+
+SYNC_EVERY = 256  # records
+SYNC_INTERVAL = 1.0  # seconds
+
+MODEL_NAMES = ("constant", "eased", "exponential", "friction-drag")
+MODEL_PARAMETERS = {"eased": "power", "exponential": "rate", "friction-drag": "drag"}
+_MODEL_CODES = {
+    deceleration.MODELS[name]: code for code, name in enumerate(MODEL_NAMES)
+}
+
+
+@dataclass(frozen=True)
+class SpinRecord:
+    """Single journal record"""
+
+    sectors_amount: int
+    spin_coeff: int
+    spins_amount: int
+    outcome: int
+    model: int
+    uniform: bool
+    layout: int
+    spin_time: float
+    target_angle: float
+    initial_angle: float
+    initial_speed: float
+    acceleration: float
+    model_parameter: float
+    seed: int
+
+
+def encode_model(model: deceleration.DecelerationModel) -> tuple:
+    """Returns `(model code, model parameter)` of the deceleration `model`"""
+
+    if model is None:
+        return 0, 0.0
+
+    code = _MODEL_CODES[type(model)]
+    attribute = MODEL_PARAMETERS.get(MODEL_NAMES[code])
+    parameter = getattr(model, attribute) if attribute else 0.0
+
+    return code, float(parameter)
+
+
+def _weights_digest(weights: array) -> bytes:
+    return hashlib.blake2b(weights.tobytes(), digest_size=16).digest()
+
+
+def read_layouts(path: str) -> list:
+    """
+    Returns sector weights of the layouts recorded next to the journal
+    at `path`, layout number `i` is at the index `i - 1`. A layout cut
+    short by a crash at the end of the file is ignored
+    """
+
+    try:
+        with open(path + LAYOUTS_SUFFIX, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return []
+
+    magic, version, _ = _HEADER.unpack_from(data)
+    if magic != LAYOUTS_MAGIC or version != VERSION:
+        raise ValueError(f"{path}{LAYOUTS_SUFFIX} is not a spin journal layouts file")
+
+    layouts = []
+    offset = _HEADER.size
+    while offset + _LAYOUT.size <= len(data):
+        digest, sectors_amount = _LAYOUT.unpack_from(data, offset)
+        offset += _LAYOUT.size
+        weights = array("d")
+        size = weights.itemsize * sectors_amount
+        if offset + size > len(data):
+            break
+        weights.frombytes(data[offset : offset + size])
+        offset += size
+        if _weights_digest(weights) != digest:
+            raise ValueError(f"layout {len(layouts) + 1} does not match its digest")
+        layouts.append(tuple(weights))
+
+    return layouts
+
+
+class SpinJournal:
+    """
+    Appends spins to the journal at `path`. Records are written and
+    fsynced after `sync every` records or `sync interval` seconds,
+    whichever comes first, and on `sync` or `close`. A timer thread
+    syncs records left pending when no more spins are appended
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sync_every: int = SYNC_EVERY,
+        sync_interval: float = SYNC_INTERVAL,
+    ):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size))
+            self._sync()
+        self._pending = bytearray()
+        self._pending_amount = 0
+        self._last_sync = time.monotonic()
+        # appends come from executor threads, syncs also from the timer
+        self._lock = threading.Lock()
+        self._timer = None
+
+        self._layout_numbers = {
+            weights: number
+            for number, weights in enumerate(read_layouts(path), start=1)
+        }
+        self._layouts_file = None
+
+    def layout_number(self, layout: SectorLayout) -> int:
+        """
+        Returns number of the `layout` in the layouts file, recording
+        it first if it is new. Uniform layouts are not recorded, 0
+        """
+
+        if layout.is_uniform:
+            return 0
+
+        with self._lock:
+            number = self._layout_numbers.get(layout.weights)
+            if number is None:
+                if self._layouts_file is None:
+                    self._layouts_file = open(self.path + LAYOUTS_SUFFIX, "ab")
+                    if self._layouts_file.tell() == 0:
+                        self._layouts_file.write(
+                            _HEADER.pack(LAYOUTS_MAGIC, VERSION, _LAYOUT.size)
+                        )
+                weights = array("d", layout.weights)
+                self._layouts_file.write(
+                    _LAYOUT.pack(_weights_digest(weights), len(weights))
+                    + weights.tobytes()
+                )
+                # on disk before any record that refers to it
+                self._layouts_file.flush()
+                os.fsync(self._layouts_file.fileno())
+                number = len(self._layout_numbers) + 1
+                self._layout_numbers[layout.weights] = number
+
+        return number
+
+    def append(self, spin: Spin, seed: int = 0):
+        """Records the `spin` planned from the RNG `seed`"""
+
+        model, model_parameter = encode_model(spin.model)
+        self.append_record(
+            SpinRecord(
+                spin.sectors_amount,
+                spin.spin_coeff,
+                spin.spins_amount,
+                spin.outcome,
+                model,
+                spin.layout.is_uniform,
+                self.layout_number(spin.layout),
+                spin.spin_time,
+                spin.target_angle,
+                spin.initial_angle,
+                spin.initial_speed,
+                spin.acceleration,
+                model_parameter,
+                seed,
+            )
+        )
+
+    def append_record(self, record: SpinRecord):
+        self.append_records([record])
+
+    def append_records(self, records: list):
+        """
+        Records all the `records` or, when one of them can not be
+        encoded, none of them
+        """
+
+        data = b"".join(
+            _RECORD.pack(
+                record.sectors_amount,
+                record.spin_coeff,
+                record.spins_amount,
+                record.outcome,
+                record.model,
+                record.uniform,
+                record.layout,
+                record.spin_time,
+                record.target_angle,
+                record.initial_angle,
+                record.initial_speed,
+                record.acceleration,
+                record.model_parameter,
+                record.seed,
+            )
+            for record in records
+        )
+
+        with self._lock:
+            self._pending += data
+            self._pending_amount += len(records)
+
+            if (
+                self._pending_amount >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval
+            ):
+                self._write_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self._sync_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync(self):
+        """Writes pending records and waits for them to reach the disk"""
+
+        with self._lock:
+            self._write_pending()
+
+    def _sync_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._pending and not self._file.closed:
+                self._write_pending()
+
+    def _write_pending(self):
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+            self._pending_amount = 0
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._file.closed:
+                self._write_pending()
+                self._file.close()
+            if self._layouts_file is not None:
+                self._layouts_file.close()
+                self._layouts_file = None
+
+    def __enter__(self) -> "SpinJournal":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JournalReader:
+    """
+    Memory-mapped read access to the journal at `path`. A record cut
+    short by a crash at the end of the file is ignored
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a spin journal")
+        if version != VERSION or record_size != _RECORD.size:
+            raise ValueError(f"unsupported spin journal version {version}")
+
+        self.path = path
+        self._models = {}
+        self._layouts = None
+        self._layout_cache = {}
+
+    def __len__(self) -> int:
+        return (len(self._mmap) - _HEADER.size) // _RECORD.size
+
+    def __getitem__(self, index: int) -> SpinRecord:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("spin journal index out of range")
+
+        return SpinRecord(
+            *_RECORD.unpack_from(self._mmap, _HEADER.size + index * _RECORD.size)
+        )
+
+    def __iter__(self):
+        # records are unpacked one by one, an iterator left unfinished
+        # holds no view of the map that would keep it from closing
+        end = _HEADER.size + len(self) * _RECORD.size
+        for offset in range(_HEADER.size, end, _RECORD.size):
+            yield SpinRecord(*_RECORD.unpack_from(self._mmap, offset))
+
+    def to_numpy(self):
+        """
+        Returns all records as a numpy structured array backed by the
+        mapped file, without copying. The array stays valid after the
+        reader is closed. Requires numpy
+        """
+
+        import numpy as np
+
+        dtype = np.dtype(
+            {
+                "names": [
+                    "sectors_amount",
+                    "spin_coeff",
+                    "spins_amount",
+                    "outcome",
+                    "model",
+                    "uniform",
+                    "layout",
+                    "spin_time",
+                    "target_angle",
+                    "initial_angle",
+                    "initial_speed",
+                    "acceleration",
+                    "model_parameter",
+                    "seed",
+                ],
+                "formats": ["<i4"] * 4 + ["u1", "?", "<u4"] + ["<f8"] * 6 + ["<u8"],
+                "offsets": [0, 4, 8, 12, 16, 17, 20, 24, 32, 40, 48, 56, 64, 72],
+                "itemsize": _RECORD.size,
+            }
+        )
+
+        end = _HEADER.size + len(self) * _RECORD.size
+        view = memoryview(self._mmap)[_HEADER.size : end]
+
+        return np.frombuffer(view, dtype=dtype)
+
+    def layout(self, record: SpinRecord) -> SectorLayout:
+        """
+        Returns sector layout of the `record`, `None` when its sectors
+        were weighted but the weights were not recorded
+        """
+
+        if record.layout == 0:
+            if not record.uniform:
+                return None
+            return SectorLayout.uniform(record.sectors_amount)
+
+        layout = self._layout_cache.get(record.layout)
+        if layout is None:
+            if self._layouts is None:
+                self._layouts = read_layouts(self.path)
+            if record.layout > len(self._layouts):
+                raise ValueError(f"layout {record.layout} is not recorded")
+            layout = SectorLayout(self._layouts[record.layout - 1])
+            self._layout_cache[record.layout] = layout
+
+        return layout
+
+    def _model(self, record: SpinRecord) -> deceleration.DecelerationModel:
+        # one model per parameters, so replays share solved motions
+        if record.model == 0:
+            return None
+
+        key = (record.model, record.model_parameter)
+        model = self._models.get(key)
+        if model is None:
+            model = deceleration.MODELS[MODEL_NAMES[record.model]](
+                record.model_parameter
+            )
+            self._models[key] = model
+
+        return model
+
+    def replay(self, index: int) -> Spin:
+        """
+        Restores the spin with the given `index`. Spins of weighted
+        sectors without recorded weights get uniform sectors
+        """
+
+        record = self[index]
+
+        return Spin(
+            record.sectors_amount,
+            record.spin_coeff,
+            record.spin_time,
+            record.target_angle,
+            record.initial_angle,
+            record.spins_amount,
+            record.initial_speed,
+            record.acceleration,
+            self.layout(record),
+            self._model(record),
+        )
+
+    def close(self):
+        try:
+            self._mmap.close()
+        except BufferError:
+            # arrays of `to_numpy` are still alive, the map is closed
+            # with the last of them
+            pass
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay a spin journal")
+    parser.add_argument("path")
+    parser.add_argument("index", type=int, nargs="?", help="spin to replay")
+    parser.add_argument("--fps", type=float, default=60)
+    args = parser.parse_args()
+
+    with JournalReader(args.path) as reader:
+        if args.index is None:
+            print(f"{len(reader)} spins")
+            return
+
+        record = reader[args.index]
+        print(record)
+        spin = reader.replay(args.index)
+        trajectory = spin.trajectory(args.fps)
+        for i in range(len(trajectory)):
+            angle, speed, sector = trajectory.frame(i)
+            print(f"{trajectory.frame_time(i):.4f} {angle!r} {speed!r} {sector}")
+        if reader.layout(record) is None:
+            print("sector weights were not recorded, the outcome is not checked")
+        elif spin.outcome != record.outcome:
+            raise SystemExit(
+                f"replayed outcome {spin.outcome} does not match {record.outcome}"
+            )
+
+
+if __name__ == "__main__":
+    main()
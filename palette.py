@@ -0,0 +1,132 @@
+"""
+Sector palette module.
+
+Generates pastel sector colors for the whole wheel at once with
+NumPy instead of a `colorsys` call per sector. Hues of adjacent
+sectors, including the last and the first one, are at least
+`MIN_HUE_STEP` apart, so neighbours never blend into each other.
+Palettes of a seed are the same in every session and are cached
+least recently used first.
+
+Requires numpy.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_SIZE = 32  # palettes
+MIN_HUE_STEP = 0.15  # of the full hue circle, between adjacent sectors
+SATURATION = (0.35, 1.0)
+LIGHTNESS = (0.5, 0.85)  # pastel range
+
+
+def hls_to_rgb(h, l, s) -> tuple:
+    """
+    Vectorized analog of the `colorsys.hls_to_rgb`, returns `(r, g, b)`
+    arrays of the broadcast `h`, `l`, `s` arrays
+    """
+
+    h, l, s = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (h, l, s))
+    )
+    m2 = np.where(l <= 0.5, l * (1 + s), l + s - l * s)
+    m1 = 2 * l - m2
+
+    def channel(hue):
+        hue = hue % 1
+        return np.select(
+            [hue < 1 / 6, hue < 0.5, hue < 2 / 3],
+            [m1 + (m2 - m1) * hue * 6, m2, m1 + (m2 - m1) * (2 / 3 - hue) * 6],
+            m1,
+        )
+
+    gray = s == 0
+    return tuple(
+        np.where(gray, l, channel(h + offset)) for offset in (1 / 3, 0, -1 / 3)
+    )
+
+
+def generate_hues(sectors_amount: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Returns random hues (between 0 and 1) of the sectors, with adjacent
+    ones at least `MIN_HUE_STEP` apart around the wheel
+    """
+
+    steps = rng.uniform(MIN_HUE_STEP, 1 - MIN_HUE_STEP, sectors_amount)
+    steps[0] = rng.uniform(0, 1)  # hue of the first sector
+    hues = np.cumsum(steps) % 1
+
+    if sectors_amount > 2:
+        # the last sector also neighbours the first one, put its hue
+        # in the middle of the longer arc between its neighbours,
+        # which is at least a quarter of the circle away from both
+        previous, first = hues[-2], hues[0]
+        arc = (first - previous) % 1
+        if arc < 0.5:
+            arc -= 1
+        hues[-1] = (previous + arc / 2) % 1
+
+    return hues
+
+
+def generate_palette(sectors_amount: int, seed: int = None) -> list:
+    """
+    Generates pastel colors of the sectors as hex strings. Palettes
+    of the same `seed` are the same, no `seed` gives a random one
+    """
+
+    rng = np.random.default_rng(seed)
+    hues = generate_hues(sectors_amount, rng)
+    saturations = rng.uniform(*SATURATION, sectors_amount)
+    lightnesses = rng.uniform(*LIGHTNESS, sectors_amount)
+
+    r, g, b = (
+        (channel * 255).astype(np.int64)
+        for channel in hls_to_rgb(hues, lightnesses, saturations)
+    )
+    packed = (r << 16) | (g << 8) | b
+
+    return ["#%06x" % color for color in packed.tolist()]
+
+
+class PaletteCache:
+    """Palettes keyed by `(sectors amount, seed)`, up to `cache size` of them"""
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._palettes = OrderedDict()
+
+    def get(self, sectors_amount: int, seed: int = None) -> tuple:
+        """
+        Returns the palette of the given `seed`, see `generate_palette`.
+        Random palettes without a `seed` are not cached
+        """
+
+        if seed is None:
+            return tuple(generate_palette(sectors_amount))
+
+        key = (sectors_amount, seed)
+        palette = self._palettes.get(key)
+        if palette is not None:
+            self._palettes.move_to_end(key)
+            return palette
+
+        palette = tuple(generate_palette(sectors_amount, seed))
+        self._palettes[key] = palette
+        if len(self._palettes) > self.cache_size:
+            self._palettes.popitem(last=False)
+
+        return palette
+
+    def clear(self):
+        self._palettes.clear()
+
+
+_cache = PaletteCache()
+
+
+def get_palette(sectors_amount: int, seed: int = None) -> tuple:
+    """Returns the palette of the given `seed` from the shared cache"""
+
+    return _cache.get(sectors_amount, seed)
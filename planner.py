@@ -0,0 +1,175 @@
+"""
+Spin planning module.
+
+Headless orchestration of a spin: from the wheel settings and the
+target angle to the full set of kinematic values. Does not depend
+on any GUI toolkit.
+"""
+
+from dataclasses import dataclass, field
+
+import crossings
+import roulette
+from deceleration import ConstantMotion, DecelerationModel, Motion
+from sectors import SectorLayout
+from trajectory import SpinTrajectory
+
+
+@dataclass(frozen=True)
+class Spin:
+    """Full plan of a single spin"""
+
+    sectors_amount: int
+    spin_coeff: int
+    spin_time: float
+    target_angle: float
+    initial_angle: float
+    spins_amount: int
+    initial_speed: float
+    acceleration: float
+    layout: SectorLayout = field(default=None, repr=False)
+    model: DecelerationModel = field(default=None, repr=False)
+    motion: Motion = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.layout is None:
+            object.__setattr__(
+                self, "layout", SectorLayout.uniform(self.sectors_amount)
+            )
+
+        # constant deceleration without a model, as in `roulette`
+        if self.model is None:
+            motion = ConstantMotion.from_speed(
+                self.initial_speed, self.acceleration, self.spin_time
+            )
+        else:
+            motion = self.model.solve(self.path, self.spin_time)
+        object.__setattr__(self, "motion", motion)
+
+    @property
+    def path(self) -> float:
+        """Degrees the wheel travels during the spin"""
+
+        return self.target_angle + 360 * self.spins_amount - self.initial_angle
+
+    @property
+    def outcome(self) -> int:
+        """Sector the wheel stops at"""
+
+        return self.layout.angle_to_sector(self.target_angle % 360)
+
+    def angle_at(self, cur_time: float) -> float:
+        """Returns `wheel position` at the given `time` of the spin"""
+
+        return self.motion.angle(cur_time, self.initial_angle)
+
+    def speed_at(self, cur_time: float) -> float:
+        """Returns `wheel speed` at the given `time` of the spin"""
+
+        return self.motion.speed(cur_time)
+
+    def acceleration_at(self, cur_time: float) -> float:
+        """Returns `wheel acceleration` at the given `time` of the spin"""
+
+        return self.motion.acceleration(cur_time)
+
+    def sector_at(self, cur_time: float) -> int:
+        """Returns selected sector at the given `time` of the spin"""
+
+        return self.layout.angle_to_sector(self.angle_at(cur_time))
+
+    def crossings(self, start_time: float = 0):
+        """
+        Yields `(time, left sector, entered sector)` of every sector
+        change of the spin after the `start time` in time order
+        """
+
+        return crossings.iter_crossings(
+            self.initial_speed,
+            self.acceleration,
+            self.spin_time,
+            self.initial_angle,
+            self.layout,
+            self.motion,
+            start_time,
+            self.target_angle,
+        )
+
+    def trajectory(self, fps: float = 60, stepped: bool = False) -> SpinTrajectory:
+        """Samples the spin at the given `fps`, see `SpinTrajectory`"""
+
+        return SpinTrajectory(
+            self.initial_speed,
+            self.acceleration,
+            self.spin_time,
+            self.initial_angle,
+            self.sectors_amount,
+            fps,
+            self.layout,
+            self.motion,
+            stepped,
+        )
+
+
+class SpinPlanner:
+    """
+    Plans spins of a wheel with the given settings. Sectors are
+    uniform unless a sector `layout` is given, deceleration is
+    constant unless a deceleration `model` is given
+    """
+
+    def __init__(
+        self,
+        sectors_amount: int,
+        spin_coeff: int,
+        spin_time: float,
+        layout: SectorLayout = None,
+        model: DecelerationModel = None,
+    ):
+        if layout is None:
+            layout = SectorLayout.uniform(sectors_amount)
+        self.layout = layout
+        self.sectors_amount = self.layout.sectors_amount
+        self.spin_coeff = spin_coeff
+        self.spin_time = spin_time
+        self.model = model
+        self.spins_amount = roulette.get_spins_amount(spin_coeff, spin_time)
+
+    def plan(self, target_angle: float, current_angle: float = 0) -> Spin:
+        """
+        Plans a spin that starts at the `current angle` and stops
+        at the `target angle`
+        """
+
+        # the wheel always moves forward, so the start is shifted a
+        # turn back when the target is not ahead of it
+        initial_angle = current_angle
+        if current_angle - target_angle >= 0:
+            initial_angle -= 360
+
+        if self.model is None:
+            initial_speed = roulette.get_initial_speed(
+                target_angle, self.spins_amount, self.spin_time, initial_angle
+            )
+            acceleration = roulette.get_acceleration(initial_speed, self.spin_time)
+        else:
+            # solved once per path, `Spin` gets the cached motion back
+            motion = self.model.solve(
+                target_angle + 360 * self.spins_amount - initial_angle,
+                self.spin_time,
+            )
+            initial_speed = motion.initial_speed
+            acceleration = motion.acceleration(0)
+
+        return Spin(
+            self.sectors_amount,
+            self.spin_coeff,
+            self.spin_time,
+            target_angle,
+            initial_angle,
+            self.spins_amount,
+            initial_speed,
+            acceleration,
+            self.layout,
+            self.model,
+        )
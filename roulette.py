@@ -7,6 +7,8 @@ We assume that the wheel rotates uniformly with constant
 negative acceleration.
 """
 
+import math
+
 import utils
 
 SPIN_COEF_MIN = 1
@@ -85,3 +87,18 @@ def get_speed(initial_speed: float, acceleration: float, cur_time: float) -> flo
     cur_speed = initial_speed + acceleration * cur_time
 
     return cur_speed
+
+
+def get_time(initial_speed: float, acceleration: float, path: float) -> float:
+    """
+    Returns the time the wheel takes to travel the given `path` (in
+    degrees, not wrapped) from the given `initial speed` and
+    `acceleration`. Inverse of `get_angle` for paths up to the stop
+    """
+
+    # `2 * path / (v0 + sqrt(...))` is the root of the quadratic that
+    # does not lose precision when `acceleration` is close to zero
+    discriminant = max(pow(initial_speed, 2) + 2 * acceleration * path, 0)
+    cur_time = 2 * path / (initial_speed + math.sqrt(discriminant))
+
+    return cur_time
@@ -0,0 +1,131 @@
+"""
+Vectorized roulette modeling module.
+
+NumPy-backed batch variants of the `roulette` and `utils`
+functions. Every argument may be a scalar or an array; arguments
+are broadcast against each other the same way numpy does.
+
+Results are bit-compatible with the scalar functions: the
+operations are performed in the same order and on the same
+float64 values.
+"""
+
+import numpy as np
+
+import roulette
+
+
+def get_spins_amount(spins_amount_coeff, spin_time) -> np.ndarray:
+    """
+    Calculates wheel `spins amounts` from the given `spin times`
+    and `spin coeffs`
+    """
+
+    spins_amount_coeff = np.asarray(spins_amount_coeff, dtype=np.float64)
+    spin_time = np.asarray(spin_time, dtype=np.float64)
+
+    normalized_coeff = interpolate(
+        spins_amount_coeff,
+        roulette.SPIN_COEF_MIN,
+        roulette.SPIN_COEF_MAX,
+        roulette.SPIN_COEF_MIN_NORM,
+        roulette.SPIN_COEF_MAX_NORM,
+    )
+
+    return np.trunc(normalized_coeff * spin_time).astype(np.int64)
+
+
+def get_initial_speed(
+    target_angle, spins_amount, target_time, initial_angle=0
+) -> np.ndarray:
+    """
+    Calculates wheel `initial speeds` from the given `target
+    angles`, `amounts of spins`, `spin times` and `initial angles`
+    """
+
+    target_angle = np.asarray(target_angle, dtype=np.float64)
+    spins_amount = np.asarray(spins_amount)
+    target_time = np.asarray(target_time, dtype=np.float64)
+    initial_angle = np.asarray(initial_angle, dtype=np.float64)
+
+    total_path = target_angle + 360 * spins_amount - initial_angle
+
+    return 2 * total_path / target_time
+
+
+def get_acceleration(initial_speed, target_time) -> np.ndarray:
+    """
+    Calculates wheel accelerations from the given `initial speeds`
+    and `target times`
+    """
+
+    initial_speed = np.asarray(initial_speed, dtype=np.float64)
+    target_time = np.asarray(target_time, dtype=np.float64)
+
+    return -initial_speed / target_time
+
+
+def get_angle(initial_speed, acceleration, cur_time, initial_angle=0) -> np.ndarray:
+    """
+    Returns `wheel positions` (angles in degrees between 0 and 360)
+    at the given `times` from the given `accelerations`, `initial
+    speeds`, and `initial angles`
+    """
+
+    initial_speed = np.asarray(initial_speed, dtype=np.float64)
+    acceleration = np.asarray(acceleration, dtype=np.float64)
+    cur_time = np.asarray(cur_time, dtype=np.float64)
+    initial_angle = np.asarray(initial_angle, dtype=np.float64)
+
+    # same evaluation order as `roulette.get_angle`; `float_power`
+    # goes through libm `pow` like the builtin does (`t * t` and
+    # `np.power` may differ from it in the last bit)
+    angle = initial_angle + initial_speed * cur_time + (
+        acceleration * np.float_power(cur_time, 2)
+    ) / 2
+
+    return np.mod(angle, 360)
+
+
+def get_speed(initial_speed, acceleration, cur_time) -> np.ndarray:
+    """
+    Returns `wheel speeds` at the given `times` from the given
+    `initial speeds` and `accelerations`
+    """
+
+    initial_speed = np.asarray(initial_speed, dtype=np.float64)
+    acceleration = np.asarray(acceleration, dtype=np.float64)
+    cur_time = np.asarray(cur_time, dtype=np.float64)
+
+    return initial_speed + acceleration * cur_time
+
+
+def interpolate(x, in_min, in_max, out_min, out_max) -> np.ndarray:
+    """Vectorized analog of the `utils.interpolate`"""
+
+    x = np.asarray(x, dtype=np.float64)
+
+    return out_min + (x - in_min) * (out_max - out_min) / (in_max - in_min)
+
+
+def angle_to_sector(angle, sectors_amount) -> np.ndarray:
+    """Converts angles in degrees to sector numbers"""
+
+    angle = np.asarray(angle, dtype=np.float64)
+    sectors_amount = np.asarray(sectors_amount, dtype=np.int64)
+
+    sector = np.trunc((360 - angle) / (360 / sectors_amount)).astype(np.int64)
+
+    return np.mod(sector, sectors_amount)
+
+
+def angle_to_weighted_sector(angle, bounds) -> np.ndarray:
+    """
+    Converts angles in degrees to sector numbers of a weighted
+    layout with the given sector `bounds` (see `sectors.SectorLayout`)
+    """
+
+    bounds = np.asarray(bounds, dtype=np.float64)
+    position = np.mod(360 - np.asarray(angle, dtype=np.float64), 360)
+
+    return np.searchsorted(bounds[:-1], position, side="right") - 1
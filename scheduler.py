@@ -0,0 +1,139 @@
+"""
+Frame scheduling module.
+
+Paces the animation on the monotonic `time.perf_counter_ns` clock.
+Frame deadlines are computed from the animation start, so delays
+of single frames do not accumulate, and frames that are already
+late are skipped instead of stretching the animation. Playback of
+a spin at a variable rate maps the same clock to the spin time.
+"""
+
+import math
+import time
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MS = 1_000_000
+
+
+class FrameScheduler:
+    """
+    Schedules frames at the given `fps`. If `duration` (seconds)
+    is given, the last frame is scheduled exactly at its end
+    """
+
+    def __init__(self, fps: float = 60, duration: float = None):
+        self.fps = fps
+        self.duration = duration
+        self.start_ns = None
+        self.deadline_ns = None
+        self.frame = 0
+        self.skipped_frames = 0
+
+    @property
+    def period_ns(self) -> int:
+        return round(NS_PER_SECOND / self.fps)
+
+    def start(self):
+        """Starts the animation clock"""
+
+        self.start_ns = time.perf_counter_ns()
+        self.deadline_ns = self.start_ns
+        self.frame = 0
+        self.skipped_frames = 0
+
+    def elapsed(self) -> float:
+        """Returns seconds passed since the start"""
+
+        return (time.perf_counter_ns() - self.start_ns) / NS_PER_SECOND
+
+    def lateness(self) -> float:
+        """Returns seconds passed since the last frame deadline"""
+
+        return max(0, time.perf_counter_ns() - self.deadline_ns) / NS_PER_SECOND
+
+    def finished(self) -> bool:
+        return self.duration is not None and self.elapsed() >= self.duration
+
+    def next_delay(self) -> int:
+        """
+        Returns milliseconds until the next frame deadline, skipping
+        the deadlines that have already passed
+        """
+
+        now_ns = time.perf_counter_ns()
+        elapsed_ns = now_ns - self.start_ns
+        period_ns = self.period_ns
+
+        frame = elapsed_ns // period_ns + 1
+        self.skipped_frames += max(0, frame - self.frame - 1)
+        self.frame = frame
+
+        deadline_ns = self.start_ns + frame * period_ns
+        if self.duration is not None:
+            deadline_ns = min(
+                deadline_ns, self.start_ns + round(self.duration * NS_PER_SECOND)
+            )
+        self.deadline_ns = deadline_ns
+
+        # rounded up, waking before the deadline would render the
+        # same frame twice
+        return max(0, -(-(deadline_ns - now_ns) // NS_PER_MS))
+
+
+class PlaybackClock:
+    """
+    Spin time of a playback running at the given `rate` (negative
+    plays backwards, 0 pauses), clamped to `[0, duration]`. Seeking
+    and rate changes re-anchor the clock, so both are O(1)
+    """
+
+    def __init__(self, duration: float, rate: float = 1):
+        self.duration = duration
+        self.rate = rate
+        self.anchor_ns = time.perf_counter_ns()
+        self.anchor_time = 0.0
+
+    def time(self) -> float:
+        """Returns current spin time"""
+
+        elapsed = (time.perf_counter_ns() - self.anchor_ns) / NS_PER_SECOND
+        spin_time = self.anchor_time + elapsed * self.rate
+
+        return min(max(spin_time, 0.0), self.duration)
+
+    def seek(self, spin_time: float):
+        """Jumps to the given spin `time`"""
+
+        self.anchor_ns = time.perf_counter_ns()
+        self.anchor_time = min(max(spin_time, 0.0), self.duration)
+
+    def set_rate(self, rate: float):
+        """Changes the rate from the current spin time on"""
+
+        self.seek(self.time())
+        self.rate = rate
+
+    def finished(self, spin_time: float = None) -> bool:
+        """
+        Whether the playback is paused or has reached its end at the
+        given spin `time`, the current one by default
+        """
+
+        if spin_time is None:
+            spin_time = self.time()
+        if self.rate > 0:
+            return spin_time >= self.duration
+        if self.rate < 0:
+            return spin_time <= 0
+
+        return True
+
+    def remaining(self) -> float:
+        """Returns seconds until the playback reaches its end"""
+
+        if self.rate > 0:
+            return (self.duration - self.time()) / self.rate
+        if self.rate < 0:
+            return self.time() / -self.rate
+
+        return math.inf
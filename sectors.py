@@ -0,0 +1,102 @@
+"""
+Sector layout module.
+
+Describes how the wheel is split into sectors of arbitrary weights
+(e.g. prize odds) and maps wheel angles to sectors in O(log n) with
+a precomputed cumulative-angle array.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+import utils
+
+
+class SectorLayout:
+    """
+    Wheel sectors with the given `weights`. Sector `i` covers the
+    angles `[bounds[i], bounds[i + 1])`, counted the same way as in
+    `utils.angle_to_sector`
+    """
+
+    def __init__(self, weights):
+        weights = tuple(float(weight) for weight in weights)
+        if not weights:
+            raise ValueError("at least one sector is required")
+        if any(not weight > 0 for weight in weights):
+            raise ValueError("sector weights must be positive")
+
+        self.weights = weights
+        self.sectors_amount = len(weights)
+        self.is_uniform = len(set(weights)) == 1
+
+        total = sum(weights)
+        self.bounds = array("d", [0.0])
+        if self.is_uniform:
+            sector_size = 360 / self.sectors_amount
+            self.bounds.extend(sector_size * i for i in range(1, self.sectors_amount))
+        else:
+            self.bounds.extend(
+                360 * cumulative / total for cumulative in accumulate(weights[:-1])
+            )
+        self.bounds.append(360.0)
+
+        self._hash = hash(weights)
+
+    @classmethod
+    def uniform(cls, sectors_amount: int) -> "SectorLayout":
+        return cls((1,) * sectors_amount)
+
+    def __len__(self) -> int:
+        return self.sectors_amount
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SectorLayout):
+            return NotImplemented
+        return self.weights == other.weights
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        if self.is_uniform:
+            return f"SectorLayout.uniform({self.sectors_amount})"
+        return f"SectorLayout({list(self.weights)})"
+
+    def start(self, sector: int) -> float:
+        """Returns angle the `sector` starts at"""
+
+        return self.bounds[sector]
+
+    def extent(self, sector: int) -> float:
+        """Returns angular width of the `sector`"""
+
+        return self.bounds[sector + 1] - self.bounds[sector]
+
+    def angle_to_sector(self, angle: float) -> int:
+        """Converts wheel angle in degrees to sector number"""
+
+        if self.is_uniform:
+            return utils.angle_to_sector(angle, self.sectors_amount)
+
+        position = (360 - angle) % 360
+        return bisect_right(self.bounds, position, 0, self.sectors_amount) - 1
+
+    def angles_to_sectors(self, angles):
+        """Vectorized `angle_to_sector` for arrays of angles. Requires numpy"""
+
+        import roulette_batch
+
+        if self.is_uniform:
+            return roulette_batch.angle_to_sector(angles, self.sectors_amount)
+
+        return roulette_batch.angle_to_weighted_sector(angles, self.bounds)
+
+    def sector_to_angle(self, sector: int, position: float = 0.5) -> float:
+        """
+        Returns wheel angle at which the `sector` is selected, with
+        `position` (0 to 1) being the relative place inside the sector
+        """
+
+        return (360 - (self.bounds[sector] + self.extent(sector) * position)) % 360
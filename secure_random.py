@@ -0,0 +1,105 @@
+"""
+Secure random module.
+
+Outcome randomness backed by `os.urandom`. Entropy is fetched in
+large blocks and converted to floats in bulk, so secure draws do not
+pay for a system call or bit twiddling in Python each. Cosmetic
+randomness (e.g. colors) should keep using the module-level `random`.
+"""
+
+import os
+import random
+import weakref
+from array import array
+
+BLOCK_SIZE = 64 * 1024  # bytes of entropy fetched at once
+
+# maps a random byte to the top mantissa nibble under the exponent of
+# 1.0, so that every 8 bytes read as a double in [1, 2)
+_EXPONENT_TABLE = bytes(0xF0 | (byte & 0x0F) for byte in range(256))
+
+_pools = weakref.WeakSet()
+
+
+class SecureRandom(random.Random):
+    """
+    `random.Random` drawing from buffered `os.urandom` entropy. Floats
+    carry 52 random bits. Like `random.SystemRandom`, it cannot be
+    seeded and has no state to save or restore. Instances are not
+    thread-safe
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size - block_size % 8
+        super().__init__()
+        self._reset()
+        _pools.add(self)
+
+    def _reset(self):
+        # the bound `__next__` of a generator is called directly by
+        # `random()` callers, there is no Python frame per draw
+        self.random = self._floats().__next__
+        self._next_word = self._words().__next__
+
+    def _floats(self):
+        words_amount = self.block_size // 8
+        while True:
+            block = bytearray(os.urandom(self.block_size))
+            block[7::8] = b"\x3f" * words_amount
+            block[6::8] = block[6::8].translate(_EXPONENT_TABLE)
+            yield from map((1.0).__rsub__, array("d", block))
+
+    def _words(self):
+        while True:
+            yield from array("Q", os.urandom(self.block_size))
+
+    def random(self) -> float:
+        """Returns a random float in [0, 1)"""
+
+        # replaced per instance in `_reset`
+        return self.random()
+
+    def getrandbits(self, k: int) -> int:
+        """Returns an int with `k` random bits"""
+
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k <= 64:
+            return self._next_word() >> (64 - k)
+
+        words = (k + 63) // 64
+        value = 0
+        for _ in range(words):
+            value = (value << 64) | self._next_word()
+
+        return value >> (words * 64 - k)
+
+    def randbytes(self, n: int) -> bytes:
+        return os.urandom(n)
+
+    def sector(self, sectors_amount: int) -> int:
+        """Returns a uniformly random sector number"""
+
+        return self._randbelow(sectors_amount)
+
+    def seed(self, *args, **kwargs):
+        """Does nothing, the entropy source cannot be seeded"""
+
+        return None
+
+    def _notimplemented(self, *args, **kwargs):
+        raise NotImplementedError("secure entropy source has no state")
+
+    getstate = setstate = _notimplemented
+
+
+def _reset_pools():
+    # a forked child must not replay the entropy buffered by its parent
+    for pool in _pools:
+        pool._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools)
+
+outcome_random = SecureRandom()
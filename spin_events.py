@@ -0,0 +1,138 @@
+"""
+Spin events module.
+
+Precomputes the moments of a spin that matter to the UI and to
+audio: the wheel entering a sector, slowing below a speed threshold
+and stopping. Subscribers are only called at those moments, so
+nothing has to poll the wheel state every frame.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+
+from planner import Spin
+
+SECTOR_ENTERED = "sector_entered"
+SLOWED = "slowed"
+STOPPED = "stopped"
+EVENT_KINDS = (SECTOR_ENTERED, SLOWED, STOPPED)
+
+
+@dataclass(frozen=True)
+class SpinEvent:
+    """Event of the `kind` at the spin `time`, `sector` selected then"""
+
+    kind: str
+    time: float
+    sector: int
+
+
+def iter_events(spin: Spin, slow_speed: float = 0, start_time: float = 0):
+    """
+    Yields events of the `spin` in time order. The initially selected
+    sector is entered at the start. The wheel is slowed when its
+    speed drops to `slow_speed`, or at the start if it never exceeds
+    it. Events up to the `start time` are skipped
+    """
+
+    seeking = start_time > 0
+    slow_time = 0
+    if spin.initial_speed > slow_speed:
+        slow_time = min(spin.motion.time_at_speed(slow_speed), spin.spin_time)
+
+    # a wheel on a boundary leaves its sector at once, the sector
+    # selected at the start is the one left by the next crossing
+    crossings = spin.crossings(start_time)
+    crossing = next(crossings, None)
+    while crossing is not None and crossing[0] <= start_time:
+        crossing = next(crossings, None)
+    if crossing is None:
+        start_sector = spin.outcome
+    else:
+        start_sector = crossing[1]
+        crossings = itertools.chain((crossing,), crossings)
+
+    entered = (
+        SpinEvent(SECTOR_ENTERED, cur_time, sector)
+        for cur_time, _, sector in crossings
+    )
+
+    if not seeking:
+        yield SpinEvent(SECTOR_ENTERED, 0.0, start_sector)
+
+    # sector of the slowdown is only known while merging
+    sector = start_sector
+    slowed = []
+    if not seeking or slow_time > start_time:
+        slowed.append(SpinEvent(SLOWED, slow_time, -1))
+    for event in heapq.merge(entered, slowed, key=_event_time):
+        if event.kind == SECTOR_ENTERED:
+            sector = event.sector
+            yield event
+        else:
+            yield SpinEvent(SLOWED, event.time, sector)
+
+    if not seeking or spin.spin_time > start_time:
+        yield SpinEvent(STOPPED, spin.spin_time, spin.outcome)
+
+
+def _event_time(event: SpinEvent) -> float:
+    return event.time
+
+
+class SpinEvents:
+    """
+    Dispatches events of the `spin` to subscribers as the spin time
+    is advanced
+    """
+
+    def __init__(self, spin: Spin, slow_speed: float = 0):
+        self.spin = spin
+        self.slow_speed = slow_speed
+        self.subscribers = {kind: [] for kind in EVENT_KINDS}
+        self._events = iter_events(spin, slow_speed)
+        self._next = next(self._events, None)
+
+    def subscribe(self, callback, kinds=EVENT_KINDS):
+        """Calls `callback(event)` on events of the given `kinds`"""
+
+        for kind in kinds:
+            self.subscribers[kind].append(callback)
+
+    def unsubscribe(self, callback):
+        for callbacks in self.subscribers.values():
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def seek(self, cur_time: float):
+        """
+        Continues with the events after the given spin `time` without
+        firing the skipped ones
+        """
+
+        self._events = iter_events(self.spin, self.slow_speed, cur_time)
+        self._next = next(self._events, None)
+
+    @property
+    def next_time(self) -> float:
+        """Time of the next pending event, `None` when all were fired"""
+
+        return None if self._next is None else self._next.time
+
+    def advance(self, cur_time: float) -> int:
+        """
+        Fires all pending events up to the given spin `time`, returns
+        amount of fired events
+        """
+
+        fired = 0
+        event = self._next
+        while event is not None and event.time <= cur_time:
+            for callback in self.subscribers[event.kind]:
+                callback(event)
+            fired += 1
+            event = next(self._events, None)
+        self._next = event
+
+        return fired
@@ -0,0 +1,427 @@
+"""
+Spin service module.
+
+Asyncio TCP service that plans spins and streams their outcome and
+frame samples back. The protocol is newline-delimited JSON.
+
+Request line::
+
+    {"id": 1, "sectors": 6, "spin_coeff": 1, "spin_time": 5,
+     "target_angle": 100, "initial_angle": 0, "fps": 30}
+
+(`id`, `initial_angle` and `fps` are optional). The response is a
+header line with the plan and the outcome sector, followed by
+frame chunk lines with `[time, angle, speed, sector]` samples and
+a final `{"id": 1, "done": true}` line. Invalid requests get a
+single `{"id": 1, "error": "..."}` line.
+
+Requests that arrive within a short window are planned together
+in one vectorized batch, bounded in requests and in sampled frames.
+Planned spins can be recorded to a `journal.SpinJournal` before
+they are sent.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+
+import numpy as np
+
+import roulette
+import roulette_batch
+from journal import SpinJournal, SpinRecord
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_FPS = 30
+
+BATCH_WINDOW = 0.002  # seconds to wait for more requests to coalesce
+MAX_BATCH = 1024  # requests planned in one batch at most
+MAX_BATCH_FRAMES = 1_000_000  # frames sampled in one batch at most
+MAX_PENDING = 4096  # requests waiting for planning, readers pause above it
+MAX_INFLIGHT = 16  # requests of one connection waiting for their response
+MAX_FRAMES = 100_000  # frames of a single spin
+MAX_SECTORS = 1_000_000  # sectors of a single wheel
+MAX_ANGLE = 36_000  # degrees, absolute value of the request angles
+FRAME_CHUNK = 256  # frames per response line
+
+
+def parse_request(line: bytes) -> dict:
+    """Parses and validates a request line, raises `ValueError`"""
+
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid json: {e.msg}") from None
+    if not isinstance(data, dict):
+        raise ValueError("request must be an object")
+
+    try:
+        request = {
+            "id": data.get("id"),
+            "sectors": int(data["sectors"]),
+            "spin_coeff": int(data["spin_coeff"]),
+            "spin_time": float(data["spin_time"]),
+            "target_angle": float(data["target_angle"]),
+            "initial_angle": float(data.get("initial_angle", 0)),
+            "fps": float(data.get("fps", DEFAULT_FPS)),
+        }
+    except KeyError as e:
+        raise ValueError(f"missing field {e.args[0]!r}") from None
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("fields must be finite numbers") from None
+
+    if not 1 <= request["sectors"] <= MAX_SECTORS:
+        raise ValueError(f"sectors must be between 1 and {MAX_SECTORS}")
+    if not roulette.SPIN_COEF_MIN <= request["spin_coeff"] <= roulette.SPIN_COEF_MAX:
+        raise ValueError(
+            f"spin_coeff must be between {roulette.SPIN_COEF_MIN}"
+            f" and {roulette.SPIN_COEF_MAX}"
+        )
+    for field in ("spin_time", "fps"):
+        if not math.isfinite(request[field]) or request[field] <= 0:
+            raise ValueError(f"{field} must be positive")
+    for field in ("target_angle", "initial_angle"):
+        if not abs(request[field]) <= MAX_ANGLE:
+            raise ValueError(f"{field} must be between {-MAX_ANGLE} and {MAX_ANGLE}")
+    if request_frames(request) > MAX_FRAMES:
+        raise ValueError("too many frames")
+
+    return request
+
+
+def request_frames(request: dict) -> int:
+    """Returns amount of frames sampled for the parsed `request`"""
+
+    return math.ceil(request["spin_time"] * request["fps"]) + 1
+
+
+def plan_batch(requests: list) -> list:
+    """
+    Plans the given parsed `requests` at once and samples their
+    frames. Returns a `(plan, frames)` pair per request, where
+    `frames` is an array of `[time, angle, speed, sector]` rows.
+    Raises `ValueError` when a spin is too fast to represent
+    """
+
+    def column(name, dtype=np.float64):
+        return np.fromiter((r[name] for r in requests), dtype, len(requests))
+
+    sectors = column("sectors", np.int64)
+    spin_time = column("spin_time")
+    target_angle = column("target_angle")
+    current_angle = column("initial_angle")
+    fps = column("fps")
+
+    spins_amount = roulette_batch.get_spins_amount(column("spin_coeff"), spin_time)
+    # same shift as `planner.SpinPlanner.plan`
+    initial_angle = np.where(
+        current_angle - target_angle >= 0, current_angle - 360, current_angle
+    )
+    # overflows are reported below, not as warnings
+    with np.errstate(over="ignore", invalid="ignore"):
+        initial_speed = roulette_batch.get_initial_speed(
+            target_angle, spins_amount, spin_time, initial_angle
+        )
+        acceleration = roulette_batch.get_acceleration(initial_speed, spin_time)
+    if not (np.isfinite(initial_speed).all() and np.isfinite(acceleration).all()):
+        raise ValueError("spin is too fast")
+    outcome = roulette_batch.angle_to_sector(np.mod(target_angle, 360), sectors)
+
+    # frames of all the spins are evaluated as one flat array
+    frames_amount = np.ceil(spin_time * fps).astype(np.int64) + 1
+    owner = np.repeat(np.arange(len(requests)), frames_amount)
+    offsets = np.cumsum(frames_amount) - frames_amount
+    index = np.arange(len(owner)) - offsets[owner]
+    times = np.minimum(index / fps[owner], spin_time[owner])
+
+    angles = roulette_batch.get_angle(
+        initial_speed[owner], acceleration[owner], times, initial_angle[owner]
+    )
+    frames = np.column_stack(
+        (
+            times,
+            angles,
+            roulette_batch.get_speed(initial_speed[owner], acceleration[owner], times),
+            roulette_batch.angle_to_sector(angles, sectors[owner]),
+        )
+    )
+
+    results = []
+    for i, request in enumerate(requests):
+        plan = {
+            "id": request["id"],
+            "outcome": int(outcome[i]),
+            "spins_amount": int(spins_amount[i]),
+            "initial_angle": float(initial_angle[i]),
+            "initial_speed": float(initial_speed[i]),
+            "acceleration": float(acceleration[i]),
+            "frames": int(frames_amount[i]),
+        }
+        start = offsets[i]
+        results.append((plan, frames[start : start + frames_amount[i]]))
+
+    return results
+
+
+class SpinService:
+    """Spin planning TCP server"""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        batch_window: float = BATCH_WINDOW,
+        max_batch: int = MAX_BATCH,
+        max_pending: int = MAX_PENDING,
+        max_inflight: int = MAX_INFLIGHT,
+        max_batch_frames: int = MAX_BATCH_FRAMES,
+        journal: SpinJournal = None,
+    ):
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_inflight = max_inflight
+        self.max_batch_frames = max_batch_frames
+        self.journal = journal
+
+        self.server = None
+        self.pending = None
+        self.batcher = None
+
+    async def start(self):
+        """Starts listening, `port` 0 picks a free port"""
+
+        self.pending = asyncio.Queue(self.max_pending)
+        self.batcher = asyncio.create_task(self.run_batcher())
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.batcher.cancel()
+        try:
+            await self.batcher
+        except asyncio.CancelledError:
+            pass
+
+    async def submit(self, request: dict) -> asyncio.Future:
+        """
+        Queues a parsed `request` for planning. Waits while the
+        planning queue is full
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        await self.pending.put((request, future))
+
+        return future
+
+    async def run_batcher(self):
+        loop = asyncio.get_running_loop()
+        # request that did not fit in the previous batch
+        carried = None
+        while True:
+            if carried is None:
+                batch = [await self.pending.get()]
+            else:
+                batch = [carried]
+                carried = None
+            # the frames of a batch are sampled as one array, its size
+            # is bounded, not only the amount of requests
+            frames = request_frames(batch[0][0])
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.pending.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                frames += request_frames(item[0])
+                if frames > self.max_batch_frames:
+                    carried = item
+                    break
+                batch.append(item)
+
+            await self.resolve(batch)
+
+    async def resolve(self, batch: list):
+        """
+        Plans the `(request, future)` pairs of the `batch` and resolves
+        their futures. A failed batch is planned again request by
+        request, so one request cannot fail the others
+        """
+
+        requests = [request for request, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                None, self.plan, requests
+            )
+        except Exception as e:
+            if len(batch) > 1:
+                for item in batch:
+                    await self.resolve([item])
+                return
+            _, future = batch[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def plan(self, requests: list) -> list:
+        """`plan_batch` that also records the spins to the journal"""
+
+        results = plan_batch(requests)
+        if self.journal is not None:
+            # a batch is recorded whole or not at all
+            self.journal.append_records(
+                [
+                    SpinRecord(
+                        request["sectors"],
+                        request["spin_coeff"],
+                        plan["spins_amount"],
+                        plan["outcome"],
+                        0,
+                        True,
+                        0,
+                        request["spin_time"],
+                        request["target_angle"],
+                        plan["initial_angle"],
+                        plan["initial_speed"],
+                        plan["acceleration"],
+                        0.0,
+                        0,
+                    )
+                    for request, (plan, _) in zip(requests, results)
+                ]
+            )
+
+        return results
+
+    async def handle_connection(self, reader, writer):
+        # responses are written in request order; the bounded queue
+        # stops reading new requests when the client does not read
+        # its responses
+        responses = asyncio.Queue(self.max_inflight)
+        sender = asyncio.create_task(self.send_responses(responses, writer))
+
+        async def put(response) -> bool:
+            # a full queue is never read again once the sender fails
+            putter = asyncio.ensure_future(responses.put(response))
+            await asyncio.wait((putter, sender), return_when=asyncio.FIRST_COMPLETED)
+            if not putter.done():
+                putter.cancel()
+                return False
+            return True
+
+        try:
+            while not sender.done():
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = parse_request(line)
+                except ValueError as e:
+                    response = _error_response(line, str(e))
+                else:
+                    future = await self.submit(request)
+                    response = (request["id"], future)
+                if not await put(response):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            if not sender.done():
+                await put(None)
+            try:
+                await sender
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def send_responses(self, responses: asyncio.Queue, writer):
+        while True:
+            response = await responses.get()
+            if response is None:
+                return
+            if isinstance(response, dict):
+                _write_line(writer, response)
+                await writer.drain()
+                continue
+
+            request_id, future = response
+            try:
+                plan, frames = await future
+            except Exception as e:
+                _write_line(
+                    writer, {"id": request_id, "error": f"planning failed: {e}"}
+                )
+                await writer.drain()
+                continue
+
+            # the whole response is buffered before waiting for the
+            # client to read it
+            _write_line(writer, plan)
+            for start in range(0, len(frames), FRAME_CHUNK):
+                chunk = frames[start : start + FRAME_CHUNK].tolist()
+                for frame in chunk:
+                    frame[3] = int(frame[3])
+                _write_line(writer, {"id": plan["id"], "frames": chunk})
+            _write_line(writer, {"id": plan["id"], "done": True})
+            await writer.drain()
+
+
+def _error_response(line: bytes, message: str) -> dict:
+    try:
+        request_id = json.loads(line).get("id")
+    except (ValueError, AttributeError):
+        request_id = None
+
+    return {"id": request_id, "error": message}
+
+
+def _write_line(writer, data: dict):
+    writer.write(json.dumps(data, separators=(",", ":")).encode() + b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roulette spin service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--journal", help="file to record the planned spins to")
+    args = parser.parse_args()
+
+    journal = SpinJournal(args.journal) if args.journal else None
+    service = SpinService(
+        args.host, args.port, args.batch_window, args.max_batch, journal=journal
+    )
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Wheel sprite cache module.
+
+Keeps pre-rasterized wheel images at quantized rotation angles, so
+an animation frame only has to swap the image shown on the canvas.
+Images are evicted least recently used first when the cache grows
+over its memory budget.
+
+Requires Pillow.
+"""
+
+from collections import OrderedDict
+
+from PIL import ImageTk
+
+import wheel_geometry
+from exporter import render_sprite
+from sectors import SectorLayout
+
+DEFAULT_RESOLUTION = 0.5  # degrees between cached rotations
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+BYTES_PER_PIXEL = 4  # Tk keeps photo images as RGBA
+
+
+class WheelSprites:
+    """Rotated images of a single wheel, see `WheelSpriteCache.wheel`"""
+
+    def __init__(self, cache: "WheelSpriteCache", key: tuple):
+        self.cache = cache
+        self.key = key
+        self.sprite = render_sprite(*key)
+        self.image_bytes = self.sprite.width * self.sprite.height * BYTES_PER_PIXEL
+        self.images_amount = 0
+
+    def get(self, angle: float) -> ImageTk.PhotoImage:
+        """Returns the wheel image rotated to the nearest cached angle"""
+
+        return self.cache.get(self, angle)
+
+
+class WheelSpriteCache:
+    """
+    Rotated wheel images keyed by colors, sector layout, level of
+    detail, radius and the angle quantized to `resolution` degrees
+    """
+
+    def __init__(
+        self,
+        resolution: float = DEFAULT_RESOLUTION,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.resolution = resolution
+        self.max_bytes = max_bytes
+        self.steps = round(360 / resolution)
+
+        self.wheels = {}
+        self.images = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def wheel(
+        self,
+        colors: list,
+        layout: SectorLayout,
+        lod: bool = True,
+        radius: int = wheel_geometry.WHEEL_RADIUS,
+    ) -> WheelSprites:
+        """
+        Returns images of the wheel with the given layout. Keep the
+        result while the layout does not change, so the (possibly
+        long) colors are not hashed every frame
+        """
+
+        key = (tuple(colors), layout, lod, radius)
+        wheel = self.wheels.get(key)
+        if wheel is None:
+            wheel = WheelSprites(self, key)
+            self.wheels[key] = wheel
+
+        return wheel
+
+    def get(self, wheel: WheelSprites, angle: float) -> ImageTk.PhotoImage:
+        step = round(angle / self.resolution) % self.steps
+        key = (wheel, step)
+
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        image = ImageTk.PhotoImage(wheel.sprite.rotate(step * self.resolution))
+        self.images[key] = image
+        self.size += wheel.image_bytes
+        wheel.images_amount += 1
+        self.wheels.setdefault(wheel.key, wheel)
+        self.evict()
+
+        return image
+
+    def evict(self):
+        """Drops least recently used images until the cache fits its budget"""
+
+        while self.size > self.max_bytes and len(self.images) > 1:
+            (wheel, _), _ = self.images.popitem(last=False)
+            self.size -= wheel.image_bytes
+            wheel.images_amount -= 1
+            if not wheel.images_amount:
+                self.wheels.pop(wheel.key, None)
+
+    def clear(self):
+        self.wheels.clear()
+        self.images.clear()
+        self.size = 0
@@ -0,0 +1,117 @@
+"""
+Angle stepping module.
+
+Advances constant deceleration spins by a fixed time step with
+forward differences: the path grows by a first difference that
+itself grows by the constant second difference `acceleration *
+step^2`, so a step is a few additions instead of evaluating
+`roulette.get_angle` from the spin start. Every `resync every`
+steps the state is recomputed exactly, which bounds the rounding
+drift of the additions.
+
+Every spin argument may be a scalar or a numpy array of concurrent
+spins; arrays are broadcast against each other the same way numpy
+does, the time step is shared.
+"""
+
+RESYNC_EVERY = 64  # steps
+
+
+class AngleStepper:
+    """
+    Wheel `angle` and `speed` of a constant deceleration spin (or
+    spins) after `index` steps of `step` seconds, starting at
+    `initial angle` with `initial speed`. Past the stop the wheel
+    would turn back, callers stop stepping at the spin time
+    """
+
+    def __init__(
+        self,
+        initial_speed,
+        acceleration,
+        step: float,
+        initial_angle=0,
+        resync_every: int = RESYNC_EVERY,
+    ):
+        if not resync_every >= 1:
+            raise ValueError("resync every must be at least 1")
+
+        self.initial_speed = initial_speed
+        self.acceleration = acceleration
+        self.step = step
+        self.initial_angle = initial_angle
+        self.resync_every = resync_every
+        # second differences of the path and of the speed are constant
+        self.path_delta_step = acceleration * step * step
+        self.speed_delta = acceleration * step
+        self.reset(0)
+
+    def reset(self, index: int):
+        """Jumps to the step with the given `index`, computed exactly"""
+
+        cur_time = index * self.step
+        self.index = index
+        # path traveled from the start, not wrapped
+        self.path = (
+            self.initial_speed * cur_time + self.acceleration * cur_time * cur_time / 2
+        )
+        # `path(index + 1) - path(index)`
+        self.path_delta = (
+            self.initial_speed * self.step
+            + self.path_delta_step * (index + 0.5)
+        )
+        self.speed = self.initial_speed + self.acceleration * cur_time
+
+    @property
+    def time(self) -> float:
+        return self.index * self.step
+
+    @property
+    def angle(self):
+        """Wheel angle (between 0 and 360) at the current step"""
+
+        return (self.initial_angle + self.path) % 360
+
+    def advance(self, steps: int = 1):
+        """Advances the spin by the given amount of `steps`"""
+
+        for _ in range(steps):
+            self.index += 1
+            if self.index % self.resync_every == 0:
+                self.reset(self.index)
+            else:
+                self.path = self.path + self.path_delta
+                self.path_delta = self.path_delta + self.path_delta_step
+                self.speed = self.speed + self.speed_delta
+
+    def iter_frames(self, frames_amount: int):
+        """
+        Yields `(angle, speed)` of the current step and the following
+        ones, `frames amount` in total, advancing the spin past them
+        """
+
+        # the scalar loop runs on locals, see `advance`
+        initial_angle = self.initial_angle
+        path_delta_step = self.path_delta_step
+        speed_delta = self.speed_delta
+        resync_every = self.resync_every
+        index = self.index
+        path = self.path
+        path_delta = self.path_delta
+        speed = self.speed
+        for _ in range(frames_amount):
+            yield (initial_angle + path) % 360, speed
+
+            index += 1
+            if index % resync_every == 0:
+                self.reset(index)
+                path, path_delta, speed = self.path, self.path_delta, self.speed
+            else:
+                path = path + path_delta
+                path_delta = path_delta + path_delta_step
+                speed = speed + speed_delta
+
+        self.index = index
+        self.path = path
+        self.path_delta = path_delta
+        self.speed = speed
@@ -0,0 +1,213 @@
+"""
+Spin trajectory module.
+
+Samples the whole spin once at a fixed frame rate, so the
+animation only has to read precomputed values instead of
+evaluating the kinematics every frame.
+"""
+
+import math
+import struct
+import sys
+from array import array
+
+import utils
+from deceleration import ConstantMotion, Motion
+from sectors import SectorLayout
+from stepper import AngleStepper
+
+# fps, spin time, initial speed, acceleration, initial angle,
+# sectors amount, frames amount
+_HEADER = struct.Struct("<dddddII")
+
+
+class SpinTrajectory:
+    """
+    Precomputed wheel `angle`, `speed` and `sector` of a spin,
+    sampled at `fps` frames per second from the spin start up to
+    `spin time` (the last frame is always exactly at `spin time`).
+    Sectors are uniform unless a sector `layout` is given,
+    deceleration is constant unless a solved `motion` is given.
+
+    Frames are evaluated exactly. `stepped` frames of a constant
+    deceleration are advanced with `stepper.AngleStepper` instead,
+    which is faster and within 1e-10 degrees of the exact angles
+    """
+
+    def __init__(
+        self,
+        initial_speed: float,
+        acceleration: float,
+        spin_time: float,
+        initial_angle: float = 0,
+        sectors_amount: int = 1,
+        fps: float = 60,
+        layout: SectorLayout = None,
+        motion: Motion = None,
+        stepped: bool = False,
+    ):
+        self.initial_speed = initial_speed
+        self.acceleration = acceleration
+        self.spin_time = spin_time
+        self.initial_angle = initial_angle
+        self.sectors_amount = sectors_amount
+        self.fps = fps
+        if layout is None:
+            layout = SectorLayout.uniform(sectors_amount)
+        self.layout = layout
+        if motion is None:
+            motion = ConstantMotion.from_speed(initial_speed, acceleration, spin_time)
+        self.motion = motion
+
+        self.angles = array("d")
+        self.speeds = array("d")
+        self.sectors = array("i")
+
+        frames_amount = max(math.ceil(spin_time * fps), 0) + 1
+        if stepped and isinstance(motion, ConstantMotion):
+            # frames before the last one are evenly spaced, step them
+            # with forward differences instead of evaluating each
+            stepper = AngleStepper(
+                motion.initial_speed, motion.acceleration(0), 1 / fps, initial_angle
+            )
+            angle_to_sector = self.layout.angle_to_sector
+            for angle, speed in stepper.iter_frames(frames_amount - 1):
+                self.angles.append(angle)
+                self.speeds.append(speed)
+                self.sectors.append(angle_to_sector(angle))
+            self._append(spin_time)
+        else:
+            for i in range(frames_amount):
+                self._append(min(i / fps, spin_time))
+
+    def _append(self, cur_time: float):
+        angle = self.motion.angle(cur_time, self.initial_angle)
+        self.angles.append(angle)
+        self.speeds.append(self.motion.speed(cur_time))
+        self.sectors.append(self.layout.angle_to_sector(angle))
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    def frame_time(self, index: int) -> float:
+        """Returns time of the frame with the given `index`"""
+
+        return min(index / self.fps, self.spin_time)
+
+    def frame(self, index: int) -> tuple:
+        """Returns `(angle, speed, sector)` of the frame with the given `index`"""
+
+        return self.angles[index], self.speeds[index], self.sectors[index]
+
+    def at_time(self, cur_time: float) -> tuple:
+        """
+        Returns `(angle, speed, sector)` at the given `time`,
+        linearly interpolated between the neighbouring frames.
+        Time is clamped to the spin bounds
+        """
+
+        last = len(self.angles) - 1
+        if cur_time <= 0:
+            return self.frame(0)
+        if cur_time >= self.spin_time:
+            return self.frame(last)
+
+        index = int(cur_time * self.fps)
+        if index >= last:
+            return self.frame(last)
+
+        start_time = index / self.fps
+        frame_span = self.frame_time(index + 1) - start_time
+        ratio = (cur_time - start_time) / frame_span
+        if ratio <= 0:
+            return self.frame(index)
+
+        # the wheel only moves forward and less than a full turn
+        # per frame, so the shortest forward delta is the real one
+        start_angle = self.angles[index]
+        delta = (self.angles[index + 1] - start_angle) % 360
+        angle = (start_angle + delta * ratio) % 360
+        speed = utils.interpolate(
+            ratio, 0, 1, self.speeds[index], self.speeds[index + 1]
+        )
+
+        return angle, speed, self.layout.angle_to_sector(angle)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes trajectory for sending it to the thin clients.
+        The deceleration model is not included, the speed of every
+        frame is. Weights of a non-uniform sector layout follow the
+        frames
+        """
+
+        header = _HEADER.pack(
+            self.fps,
+            self.spin_time,
+            self.initial_speed,
+            self.acceleration,
+            self.initial_angle,
+            self.sectors_amount,
+            len(self.angles),
+        )
+        buffers = [self.angles, self.speeds, self.sectors]
+        if not self.layout.is_uniform:
+            buffers.append(array("d", self.layout.weights))
+        body = []
+        for buffer in buffers:
+            # trajectories are always stored little-endian
+            if sys.byteorder == "big":
+                buffer = array(buffer.typecode, buffer)
+                buffer.byteswap()
+            body.append(buffer.tobytes())
+
+        return header + b"".join(body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpinTrajectory":
+        """Restores trajectory serialized with `to_bytes`"""
+
+        (
+            fps,
+            spin_time,
+            initial_speed,
+            acceleration,
+            initial_angle,
+            sectors_amount,
+            frames_amount,
+        ) = _HEADER.unpack_from(data)
+
+        trajectory = cls.__new__(cls)
+        trajectory.initial_speed = initial_speed
+        trajectory.acceleration = acceleration
+        trajectory.spin_time = spin_time
+        trajectory.initial_angle = initial_angle
+        trajectory.sectors_amount = sectors_amount
+        trajectory.fps = fps
+        trajectory.motion = ConstantMotion.from_speed(
+            initial_speed, acceleration, spin_time
+        )
+
+        offset = _HEADER.size
+        buffers = []
+        for typecode in ("d", "d", "i"):
+            buffer = array(typecode)
+            size = buffer.itemsize * frames_amount
+            buffer.frombytes(data[offset : offset + size])
+            if sys.byteorder == "big":
+                buffer.byteswap()
+            buffers.append(buffer)
+            offset += size
+
+        trajectory.angles, trajectory.speeds, trajectory.sectors = buffers
+
+        weights = array("d")
+        weights.frombytes(data[offset : offset + weights.itemsize * sectors_amount])
+        if sys.byteorder == "big":
+            weights.byteswap()
+        if weights:
+            trajectory.layout = SectorLayout(weights)
+        else:
+            trajectory.layout = SectorLayout.uniform(sectors_amount)
+
+        return trajectory
@@ -0,0 +1,110 @@
+"""
+Wheel geometry module.
+
+Layout of the wheel drawing, shared by the Tk visualizer and the
+offscreen renderers. Angles are in degrees, counterclockwise from
+3 o'clock, as on the Tk canvas.
+"""
+
+import math
+
+from sectors import SectorLayout
+
+CANVAS_WIDTH = 400
+CANVAS_HEIGHT = 450
+
+WHEEL_CENTER_X = 200
+WHEEL_CENTER_Y = 250
+WHEEL_RADIUS = 100
+LABEL_RADIUS_RATIO = 0.6
+
+ARROW = (190, 120, 210, 120, 200, 160)
+HUD_LINES_Y = (30, 50, 70, 90)
+FONT_SIZE = 14
+
+POINTER_EXTENT = 3
+
+# level of detail thresholds
+LOD_MIN_SECTOR_PX = 3  # narrowest arc on the wheel rim
+LOD_MIN_LABEL_PX = 24  # narrowest sector that still gets a label
+LOD_MAX_LABEL_SPEED = 720  # degrees per second, labels are a blur above
+
+
+def sector_start(layout: SectorLayout, sector: int, angle: float) -> float:
+    """Returns start angle of the `sector` arc at the wheel `angle`"""
+
+    return layout.bounds[sector] + angle + 90
+
+
+def pointer_start(angle: float, target_angle: float) -> float:
+    """Returns start angle of the target pointer arc"""
+
+    return angle - target_angle + 90 - 1
+
+
+def label_position(layout: SectorLayout, sector: int, angle: float) -> tuple:
+    """Returns `(x, y)` of the `sector` label at the wheel `angle`"""
+
+    mid_angle = math.radians(
+        sector_start(layout, sector, angle) + layout.extent(sector) / 2
+    )
+    r = WHEEL_RADIUS * LABEL_RADIUS_RATIO
+
+    return (
+        WHEEL_CENTER_X + r * math.cos(mid_angle),
+        WHEEL_CENTER_Y - r * math.sin(mid_angle),
+    )
+
+
+def lod_groups(layout: SectorLayout, radius: float = WHEEL_RADIUS) -> list:
+    """
+    Splits the sectors into groups of neighbours that are merged into
+    one arc, so that every group is at least `LOD_MIN_SECTOR_PX` wide
+    on the rim. Returns first sector of every group
+    """
+
+    min_extent = LOD_MIN_SECTOR_PX / (2 * math.pi * radius) * 360
+    bounds = layout.bounds
+    sectors_amount = layout.sectors_amount
+    if layout.is_uniform and bounds[1] >= min_extent:
+        return list(range(sectors_amount))
+
+    groups = []
+    i = 0
+    while i < sectors_amount:
+        groups.append(i)
+        j = i + 1
+        while j < sectors_amount and bounds[j] - bounds[i] < min_extent:
+            j += 1
+        i = j
+
+    return groups
+
+
+def label_sectors(layout: SectorLayout) -> list:
+    """Returns sectors whose labels are readable at the wheel radius"""
+
+    label_radius = WHEEL_RADIUS * LABEL_RADIUS_RATIO
+    min_extent = LOD_MIN_LABEL_PX / (2 * math.pi * label_radius) * 360
+    if layout.is_uniform:
+        fit = layout.extent(0) >= min_extent
+        return list(range(layout.sectors_amount)) if fit else []
+
+    return [
+        sector
+        for sector in range(layout.sectors_amount)
+        if layout.extent(sector) >= min_extent
+    ]
+
+
+def hud_texts(
+    selected_sector: int, speed: float, acceleration: float, target_sector: int
+) -> tuple:
+    """Returns HUD lines"""
+
+    return (
+        f"Selected: {selected_sector + 1}",
+        f"Speed: {speed:.1f}",
+        f"Acceleration: {acceleration:.1f}",
+        f"Target: {target_sector + 1}",
+    )
@@ -5,19 +5,36 @@ Draws a wheel with the controls for simulating and
 adjusting roulette parameters
 """
 
-import datetime
-import tkinter as tk
 import math
-import random
-from colorsys import hls_to_rgb
-import roulette
-import utils
+import tkinter as tk
+from time import perf_counter
+import wheel_geometry
+from alias import TargetSampler
+from instrumentation import FrameStats
+from planner import SpinPlanner
+from sectors import SectorLayout
+from spin_events import EVENT_KINDS, SECTOR_ENTERED, SpinEvents
+from scheduler import FrameScheduler, PlaybackClock
+from secure_random import outcome_random
+
+FPS = 60
+
+STATS_OVERLAY_PERIOD = 30  # frames between instrumentation overlay refreshes
+SLIDER_REFRESH_PERIOD = 0.1  # seconds between slider refreshes in a spin
+MAX_PLAYBACK_RATE = 10
+TIME_DIGITS = 2  # decimals of the time slider, in seconds
+APPLY_DEBOUNCE = 150  # ms, rapid Apply clicks are applied once
 
 
 class WheelVisualizer:
     def __init__(self, root):
         self.root = root
-        self.canvas = tk.Canvas(root, width=400, height=450, bg="white")
+        self.canvas = tk.Canvas(
+            root,
+            width=wheel_geometry.CANVAS_WIDTH,
+            height=wheel_geometry.CANVAS_HEIGHT,
+            bg="white",
+        )
         self.canvas.pack()
 
         self.angle = 0
@@ -26,7 +43,12 @@ class WheelVisualizer:
         self.running = False
         self.sectors_amount_input = tk.IntVar(value=6)
         self.sectors_amount = 6
+        self.weights_input = tk.StringVar(value="")
+        self.layout = None
+        self.target_sampler = None
         self.colors = []
+        self.palette_seed = 0  # same sector colors in every session
+        self.lod_enabled = True
 
         self.acceleration = 0
         self.initial_speed = 0
@@ -35,182 +57,550 @@ class WheelVisualizer:
         self.spin_time = 5
         self.spin_time_input = tk.IntVar(value=5)
         self.target_angle = 0
-        self.target_angle_input = tk.IntVar(value=100)
+        # sampled targets are fractional degrees, see `random_target`
+        self.target_angle_input = tk.DoubleVar(value=100)
         self.spin_coeff = tk.IntVar(value=1)
 
-        self.start_time = None
+        self.fps = FPS
+        self.scheduler = FrameScheduler(self.fps)
+        self.deceleration_model = None
+        self.planner = None
+        self.spin = None
+        self.trajectory = None
+        self.clock = None
+        self.playback_rate = 1.0
+        self.events = None
+        self.entered_sector = None
+        self.event_subscribers = []
+        self.target_sector = 0
+        # inputs the layout, wheel items and spin were last built from
+        self.layout_key = None
+        self.wheel_key = None
+        self.plan_key = None
+        self.apply_job = None
+        self.slider_value = None
+        self.time_slider_value = None
+        self.slider_time = None
+        self.stats = None
+        self.stats_item = None
+        self.sprite_cache = None
+        self.wheel_sprites = None
+        self.sprite_item = None
+        self.sprite_image = None
 
         self.create_controls()
         self.apply_settings()
 
     def generate_colors(self):
-        self.colors = []
-        for _ in range(self.sectors_amount):
-            h = random.uniform(0, 1)  # Full hue range
-            s = random.uniform(0.2, 1.0)  # Saturation
-            l = random.uniform(0.5, 0.9)  # Pastel range
-            r, g, b = hls_to_rgb(h, l, s)
-            self.colors.append(
-                "#%02x%02x%02x" % (int(r * 255), int(g * 255), int(b * 255))
-            )
+        # imported here, numpy should not slow down the module import
+        import palette
+
+        self.colors = palette.get_palette(self.sectors_amount, self.palette_seed)
+
+    def build_wheel(self):
+        """Creates wheel canvas items, `draw_wheel` only updates them"""
 
-    def draw_wheel(self):
         self.canvas.delete("wheel")
-        cx, cy, r = 200, 250, 100
-        sectors_amount = self.sectors_amount
-        sector_size = 360 / sectors_amount
-
-        selected_sector = utils.angle_to_sector(
-            self.angle, self.sectors_amount)
-
-        for i in range(sectors_amount):
-            start_angle = (360 / sectors_amount) * i + self.angle + 90
-            width = 2 if i == selected_sector else 1
-            self.canvas.create_arc(
-                cx - r,
-                cy - r,
-                cx + r,
-                cy + r,
-                start=start_angle,
-                extent=sector_size,
-                fill=self.colors[i % len(self.colors)],
-                width=width,
-                outline="black",
-                tags="wheel",
+        cx = wheel_geometry.WHEEL_CENTER_X
+        cy = wheel_geometry.WHEEL_CENTER_Y
+        r = wheel_geometry.WHEEL_RADIUS
+        font = ("Arial", wheel_geometry.FONT_SIZE, "bold")
+        layout = self.layout
+
+        # level of detail: sectors narrower than `LOD_MIN_SECTOR_PX`
+        # on the rim are merged into groups, labels that do not fit
+        # are not created at all
+        if self.lod_enabled:
+            groups = wheel_geometry.lod_groups(layout, r)
+            self.label_sectors = wheel_geometry.label_sectors(layout)
+        else:
+            groups = list(range(layout.sectors_amount))
+            self.label_sectors = groups
+
+        self.sector_items = []
+        self.group_starts = []
+        self.label_items = []
+        self.sprite_item = None
+        if self.sprite_cache is not None:
+            # the sectors are a single rotated image instead of arcs
+            self.wheel_sprites = self.sprite_cache.wheel(
+                self.colors, layout, self.lod_enabled, r
+            )
+            self.sprite_item = self.canvas.create_image(cx, cy, tags="wheel")
+            groups = []
+
+        for first, end in zip(groups, groups[1:] + [layout.sectors_amount]):
+            fill = self.colors[first % len(self.colors)]
+            self.group_starts.append(layout.bounds[first])
+            self.sector_items.append(
+                self.canvas.create_arc(
+                    cx - r,
+                    cy - r,
+                    cx + r,
+                    cy + r,
+                    extent=layout.bounds[end] - layout.bounds[first],
+                    fill=fill,
+                    width=1,
+                    outline="black" if end - first == 1 else fill,
+                    tags="wheel",
+                )
             )
-            mid_angle = math.radians(start_angle + sector_size / 2)
-            text_x = cx + r * 0.6 * math.cos(mid_angle)
-            text_y = cy - r * 0.6 * math.sin(mid_angle)
-            self.canvas.create_text(
-                text_x,
-                text_y,
-                text=str(i + 1),
-                font=("Arial", 14, "bold"),
-                tags="wheel",
+
+        # exact selected sector, drawn over the (possibly merged) arcs
+        self.selected_item = self.canvas.create_arc(
+            cx - r,
+            cy - r,
+            cx + r,
+            cy + r,
+            width=2,
+            outline="black",
+            tags="wheel",
+        )
+
+        for i in self.label_sectors:
+            self.label_items.append(
+                self.canvas.create_text(
+                    cx, cy, text=str(i + 1), font=font, tags="wheel"
+                )
             )
 
         # target pointer arc
-        self.canvas.create_arc(
+        self.pointer_item = self.canvas.create_arc(
             cx - r,
             cy - r,
             cx + r,
             cy + r,
-            start=self.angle - self.target_angle + 90 - 1,
-            extent=3,
+            extent=wheel_geometry.POINTER_EXTENT,
             fill="red",
             tags="wheel",
         )
 
         # Draw arrow
         self.canvas.create_polygon(
-            190, 120, 210, 120, 200, 160, outline="black", fill="gray", tags="wheel"
+            *wheel_geometry.ARROW, outline="black", fill="gray", tags="wheel"
         )
 
-        # Display selected sector
-        self.canvas.delete("sector_text")
-        self.canvas.create_text(
-            200,
-            30,
-            text=f"Selected: {selected_sector + 1}",
-            font=("Arial", 14, "bold"),
-            tags="sector_text",
-        )
+        # HUD texts
+        self.hud_items = []
+        self.hud_texts = []
+        for y in wheel_geometry.HUD_LINES_Y:
+            self.hud_items.append(
+                self.canvas.create_text(cx, y, font=font, tags="wheel")
+            )
+            self.hud_texts.append(None)
+
+        self.selected_sector = None
+        self.labels_visible = True
+        self.drawn_angle = None
 
-        self.canvas.delete("speed_text")
-        self.canvas.create_text(
-            200,
-            50,
-            text=f"Speed: {self.speed:.1f}",
-            font=("Arial", 14, "bold"),
-            tags="speed_text",
+    def draw_wheel(self):
+        layout = self.layout
+        # during a spin the selected sector is changed by spin events
+        if self.events is None or self.selected_sector is None:
+            self.select_sector(layout.angle_to_sector(self.angle))
+
+        labels_visible = (
+            not self.lod_enabled
+            or abs(self.speed) <= wheel_geometry.LOD_MAX_LABEL_SPEED
         )
+        if labels_visible != self.labels_visible:
+            state = "normal" if labels_visible else "hidden"
+            for item in self.label_items:
+                self.canvas.itemconfigure(item, state=state)
+            self.labels_visible = labels_visible
+            if labels_visible:
+                # hidden labels are not moved, catch them up
+                self.drawn_angle = None
+
+        if self.angle != self.drawn_angle:
+            self.drawn_angle = self.angle
+            offset = self.angle + 90
+            for start, item in zip(self.group_starts, self.sector_items):
+                self.canvas.itemconfigure(item, start=start + offset)
+            if self.sprite_item is not None:
+                self.sprite_image = self.wheel_sprites.get(self.angle)
+                self.canvas.itemconfigure(self.sprite_item, image=self.sprite_image)
+
+            if labels_visible:
+                for sector, item in zip(self.label_sectors, self.label_items):
+                    self.canvas.coords(
+                        item,
+                        *wheel_geometry.label_position(layout, sector, self.angle),
+                    )
+
+            self.canvas.itemconfigure(
+                self.selected_item,
+                start=wheel_geometry.sector_start(
+                    layout, self.selected_sector, self.angle
+                ),
+            )
+            self.canvas.itemconfigure(
+                self.pointer_item,
+                start=wheel_geometry.pointer_start(self.angle, self.target_angle),
+            )
 
-        self.canvas.delete("acc_text")
-        self.canvas.create_text(
-            200,
-            70,
-            text=f"Acceleration: {self.acceleration:.1f}",
-            font=("Arial", 14, "bold"),
-            tags="acc_text",
+        self.draw_hud(
+            *wheel_geometry.hud_texts(
+                self.selected_sector,
+                self.speed,
+                self.acceleration,
+                self.target_sector,
+            )
         )
 
-        self.canvas.delete("target_text")
-        self.canvas.create_text(
-            200,
-            90,
-            text=f"Target: {utils.angle_to_sector(self.target_angle, self.sectors_amount) + 1}",
-            font=("Arial", 14, "bold"),
-            tags="acc_text",
+    def select_sector(self, sector: int):
+        """Moves the selected sector highlight to the `sector`"""
+
+        if sector == self.selected_sector:
+            return
+
+        self.canvas.itemconfigure(
+            self.selected_item,
+            start=wheel_geometry.sector_start(self.layout, sector, self.angle),
+            extent=self.layout.extent(sector),
+            fill=self.colors[sector % len(self.colors)],
         )
+        self.selected_sector = sector
 
-    def update(self):
-        if self.speed > 0:
-            time = datetime.datetime.now() - self.start_time
-            time = time.total_seconds()
-            self.speed = roulette.get_speed(
-                self.initial_speed, self.acceleration, time)
-            self.angle = roulette.get_angle(
-                self.initial_speed, self.acceleration, time, self.initial_angle
-            )
+    def on_sector_entered(self, event):
+        # many sectors can be entered within a frame, the highlight
+        # is moved once per frame to the last one, see `update`
+        self.entered_sector = event.sector
 
-            self.angle_slider.set(self.angle)
+    def subscribe(self, callback, kinds=EVENT_KINDS):
+        """
+        Calls `callback(event)` on `spin_events` events of the given
+        `kinds` of every following spin
+        """
+
+        self.event_subscribers.append((callback, kinds))
+        if self.events is not None:
+            self.events.subscribe(callback, kinds)
+
+    def draw_hud(self, *texts):
+        """Updates HUD lines whose text has changed"""
+
+        for i, text in enumerate(texts):
+            if text != self.hud_texts[i]:
+                self.canvas.itemconfigure(self.hud_items[i], text=text)
+                self.hud_texts[i] = text
+
+    def update(self):
+        if self.running:
+            stats = self.stats
+            if stats is not None:
+                frame_start = perf_counter()
+                lateness = self.scheduler.lateness()
+                skipped_frames = self.scheduler.skipped_frames
+
+            time = self.clock.time()
+            self.angle, self.speed, _ = self.trajectory.at_time(time)
+            self.acceleration = self.spin.acceleration_at(time)
+            if time >= self.spin_time:
+                self.speed = 0
+            if self.events is not None:
+                self.events.advance(time)
+                if self.entered_sector is not None:
+                    self.select_sector(self.entered_sector)
+                    self.entered_sector = None
+            # the end reached after `time` is left to the next frame
+            finished = self.clock.finished(time)
+
+            if stats is not None:
+                kinematics_end = perf_counter()
+
+            if (
+                finished
+                or self.slider_time is None
+                or abs(time - self.slider_time) >= SLIDER_REFRESH_PERIOD
+            ):
+                self.slider_time = time
+                self.set_slider(self.angle)
+                self.set_time_slider(time)
 
             self.draw_wheel()
-            self.root.after(10, self.update)
+            if not finished:
+                delay = self.scheduler.next_delay()
+                # the last frame lands exactly on the end of the playback
+                delay = min(delay, max(0, math.ceil(self.clock.remaining() * 1000)))
+                self.root.after(delay, self.update)
+            else:
+                self.running = False
+                self.events = None
+
+            if stats is not None:
+                frame_end = perf_counter()
+                stats.record(
+                    frame_end - frame_start,
+                    kinematics_end - frame_start,
+                    frame_end - kinematics_end,
+                    lateness,
+                    self.scheduler.skipped_frames - skipped_frames,
+                )
+                if stats.frames % STATS_OVERLAY_PERIOD == 0 or finished:
+                    self.canvas.itemconfigure(
+                        self.stats_item, text=stats.overlay_text()
+                    )
+
+    def enable_instrumentation(self, capacity: int = 1024):
+        """Starts recording frame timings to `self.stats`, shows overlay"""
+
+        self.stats = FrameStats(capacity)
+        self.canvas.delete("stats")
+        self.stats_item = self.canvas.create_text(
+            5,
+            wheel_geometry.CANVAS_HEIGHT - 5,
+            anchor="sw",
+            font=("Courier", 9),
+            tags="stats",
+        )
+
+    def disable_instrumentation(self):
+        self.stats = None
+        self.canvas.delete("stats")
+        self.stats_item = None
+
+    def enable_sprites(self, cache=None):
+        """
+        Draws the sectors as a single cached image rotated in steps
+        instead of separate arcs. The default `sprite_cache.WheelSpriteCache`
+        is used unless a configured one is given. Requires Pillow
+        """
+
+        if cache is None:
+            from sprite_cache import WheelSpriteCache
+
+            cache = WheelSpriteCache()
+
+        self.sprite_cache = cache
+        self.build_wheel()
+        self.draw_wheel()
+
+    def disable_sprites(self):
+        self.sprite_cache = None
+        self.wheel_sprites = None
+        self.sprite_image = None
+        self.build_wheel()
+        self.draw_wheel()
 
     def start(self):
-        # self.stop()
         self.stop()
         self.apply_settings()
-        if self.speed <= 0:
-            self.start_time = datetime.datetime.now()
-
-            self.initial_speed = roulette.get_initial_speed(
-                self.target_angle, self.spins_amount, self.spin_time, self.initial_angle
-            )
-            self.acceleration = roulette.get_acceleration(
-                self.initial_speed, self.spin_time
-            )
-
-            self.speed = self.initial_speed
-            self.update()
+        self.prepare_playback()
+        if self.playback_rate < 0:
+            self.clock.seek(self.spin_time)
+        self.play()
+
+    def prepare_playback(self):
+        """Samples the planned spin for playback, paused at its start"""
+
+        self.initial_speed = self.spin.initial_speed
+        self.acceleration = self.spin.acceleration
+        self.trajectory = self.spin.trajectory(self.fps)
+        self.clock = PlaybackClock(self.spin_time, self.playback_rate)
+        self.time_slider.configure(to=self.spin_time)
+
+    def play(self):
+        """Plays the spin from the current playback time on"""
+
+        if self.clock is None or self.running or self.clock.finished():
+            return
+
+        self.running = True
+        if self.playback_rate > 0:
+            self.follow_events(self.clock.time())
+        self.scheduler = FrameScheduler(self.fps)
+        self.slider_time = None
+        self.scheduler.start()
+        self.update()
+
+    def follow_events(self, cur_time: float):
+        """
+        Lets spin events drive the selected sector from the given spin
+        `time` on. Events only run forwards, reverse playback and
+        seeking without playing map the angle to the sector instead
+        """
+
+        self.events = SpinEvents(self.spin, wheel_geometry.LOD_MAX_LABEL_SPEED)
+        self.events.subscribe(self.on_sector_entered, (SECTOR_ENTERED,))
+        for callback, kinds in self.event_subscribers:
+            self.events.subscribe(callback, kinds)
+        if cur_time > 0:
+            self.events.seek(cur_time)
+            self.select_sector(self.spin.sector_at(cur_time))
+
+    def seek(self, cur_time: float):
+        """Shows the spin at the given spin `time`"""
+
+        if self.clock is None:
+            self.prepare_playback()
+        self.clock.seek(cur_time)
+        cur_time = self.clock.time()
+
+        # exact closed-form values, no replanning or resampling
+        self.angle = self.spin.angle_at(cur_time)
+        self.speed = 0 if cur_time >= self.spin_time else self.spin.speed_at(cur_time)
+        self.acceleration = self.spin.acceleration_at(cur_time)
+        if self.events is not None:
+            self.events.seek(cur_time)
+            self.select_sector(self.spin.sector_at(cur_time))
+
+        self.set_slider(self.angle)
+        self.draw_wheel()
 
     def stop(self):
         # if not self.speed:
         #     self.angle = 0
 
+        self.running = False
         self.speed = 0
+        self.events = None
         self.draw_wheel()
-        self.angle_slider.set(self.angle)
+        self.set_slider(self.angle)
 
-    def apply_settings(self):
+    def request_apply(self):
+        """Applies the settings once the Apply clicks stop coming"""
 
-        self.sectors_amount = self.sectors_amount_input.get()
+        if self.apply_job is not None:
+            self.root.after_cancel(self.apply_job)
+        self.apply_job = self.root.after(APPLY_DEBOUNCE, self.apply_settings)
+
+    def apply_settings(self):
+        """
+        Applies the settings, rebuilding only what depends on the
+        changed ones: colors and wheel items on layout changes, the
+        spin on layout or kinematic changes
+        """
+
+        if self.apply_job is not None:
+            self.root.after_cancel(self.apply_job)
+            self.apply_job = None
+
+        # sector weights override the sectors amount
+        weights = self.weights_input.get().replace(",", " ").split()
+        layout_key = tuple(weights) if weights else self.sectors_amount_input.get()
+        layout_changed = layout_key != self.layout_key
+        if layout_changed:
+            if weights:
+                self.layout = SectorLayout(weights)
+            else:
+                self.layout = SectorLayout.uniform(layout_key)
+            self.layout_key = layout_key
+            self.sectors_amount = self.layout.sectors_amount
+            if self.target_sampler is None:
+                self.target_sampler = TargetSampler(self.layout)
+            else:
+                self.target_sampler.set_layout(self.layout)
+            self.generate_colors()
+        if weights:
+            self.sectors_amount_input.set(self.sectors_amount)
+
+        wheel_key = (layout_key, self.lod_enabled)
+        wheel_changed = wheel_key != self.wheel_key
+        if wheel_changed:
+            self.wheel_key = wheel_key
+            self.build_wheel()
+
+        target_changed = self.target_angle_input.get() != self.target_angle
         self.spin_time = self.spin_time_input.get()
         self.target_angle = self.target_angle_input.get()
-
-        self.spins_amount_input.set(
-            roulette.get_spins_amount(self.spin_coeff.get(), self.spin_time)
+        if layout_changed or target_changed:
+            self.target_sector = self.layout.angle_to_sector(self.target_angle)
+
+        plan_key = (
+            layout_key,
+            self.spin_time,
+            self.target_angle,
+            self.spin_coeff.get(),
+            self.angle,
+            self.deceleration_model,
         )
-        self.spins_amount = self.spins_amount_input.get()
-
-        self.initial_angle = self.angle
+        if plan_key != self.plan_key:
+            self.plan_key = plan_key
+            self.planner = SpinPlanner(
+                self.sectors_amount,
+                self.spin_coeff.get(),
+                self.spin_time,
+                self.layout,
+                self.deceleration_model,
+            )
+            self.spin = self.planner.plan(self.target_angle, self.angle)
+            # playback of the previous plan can not continue
+            self.running = False
+            self.clock = None
+            self.trajectory = None
+            self.events = None
+
+            self.spins_amount_input.set(self.spin.spins_amount)
+            self.spins_amount = self.spin.spins_amount
+            self.initial_angle = self.spin.initial_angle
+
+        if wheel_changed or target_changed:
+            # the pointer is only moved with the wheel
+            self.drawn_angle = None
+        self.draw_wheel()
 
-        if self.angle - self.target_angle >= 0:
-            self.initial_angle -= 360
+    def set_slider(self, angle: float):
+        """
+        Moves the angle slider without redrawing the wheel. Tk calls
+        the slider command later with the new value, `update_angle`
+        recognizes it by `slider_value` and ignores it
+        """
 
-        self.generate_colors()
-        self.draw_wheel()
+        value = round(angle)
+        if value != self.slider_value:
+            self.slider_value = value
+            self.angle_slider.set(value)
 
     def update_angle(self, value):
-        self.angle = float(value)
+        angle = float(value)
+        # programmatic `set_slider` echo, or scrubbing during a spin
+        # that the next frame would override anyway
+        if angle == self.slider_value or self.running:
+            return
+
+        self.slider_value = angle
+        self.angle = angle
         self.draw_wheel()
 
+    def set_time_slider(self, cur_time: float):
+        """Moves the time slider without seeking, see `set_slider`"""
+
+        value = round(cur_time, TIME_DIGITS)
+        if value != self.time_slider_value:
+            self.time_slider_value = value
+            self.time_slider.set(value)
+
+    def update_time(self, value):
+        cur_time = float(value)
+        if cur_time == self.time_slider_value:
+            return
+
+        self.time_slider_value = cur_time
+        self.seek(cur_time)
+
+    def update_rate(self, value):
+        rate = float(value)
+        if rate == self.playback_rate:
+            return
+
+        self.playback_rate = rate
+        if self.clock is None:
+            return
+        self.clock.set_rate(rate)
+        if self.running and rate > 0:
+            if self.events is None:
+                self.follow_events(self.clock.time())
+        else:
+            self.events = None
+        # changing the rate of a paused or finished playback resumes it
+        self.play()
+
     def update_spin_coeff(self, value):
         self.spin_coeff.set(value)
 
     def random_target(self):
-        self.target_angle_input.set(random.uniform(0, 360))
+        self.target_angle_input.set(self.target_sampler.sample(outcome_random))
 
     def create_controls(self):
         frame = tk.Frame(self.root)
@@ -221,6 +611,10 @@ class WheelVisualizer:
         tk.Entry(frame, textvariable=self.sectors_amount_input, width=5).pack(
             side=tk.LEFT
         )
+        tk.Label(frame, text="Weights:").pack(side=tk.LEFT)
+        tk.Entry(frame, textvariable=self.weights_input, width=10).pack(
+            side=tk.LEFT
+        )
         tk.Label(frame, text="Spin count:").pack(side=tk.LEFT)
         self.spins_amount_field = tk.Entry(
             frame, textvariable=self.spins_amount_input, width=5
@@ -236,7 +630,7 @@ class WheelVisualizer:
         tk.Button(frame, text="Rand", command=self.random_target).pack(
             side=tk.LEFT)
         tk.Button(frame, text="Apply",
-                  command=self.apply_settings).pack(side=tk.LEFT)
+                  command=self.request_apply).pack(side=tk.LEFT)
 
         # self.spins_amount_field.config(state="disabled")
 
@@ -246,11 +640,36 @@ class WheelVisualizer:
         self.spin_coeff_slider = tk.Scale(
             from_=1, to=10, orient=tk.HORIZONTAL, command=self.update_spin_coeff
         )
+        self.time_slider = tk.Scale(
+            self.root,
+            from_=0,
+            to=self.spin_time,
+            resolution=pow(10, -TIME_DIGITS),
+            orient=tk.HORIZONTAL,
+            label="Time",
+            command=self.update_time,
+        )
+        self.rate_slider = tk.Scale(
+            self.root,
+            from_=-MAX_PLAYBACK_RATE,
+            to=MAX_PLAYBACK_RATE,
+            resolution=0.1,
+            orient=tk.HORIZONTAL,
+            label="Rate",
+            command=self.update_rate,
+        )
+        self.rate_slider.set(self.playback_rate)
         self.angle_slider.pack(fill=tk.X)
         self.spin_coeff_slider.pack(fill=tk.X)
+        self.time_slider.pack(fill=tk.X)
+        self.rate_slider.pack(fill=tk.X)
 
 
-if __name__ == "__main__":
+def main():
     root = tk.Tk()
     app = WheelVisualizer(root)
     root.mainloop()
+
+
+if __name__ == "__main__":
+    main()